@@ -55,6 +55,10 @@ OLLAMA_URL: str = os.getenv("OLLAMA_URL", "http://localhost:11434")
 OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "deepseek-r1:8b")
 OLLAMA_VLM_MODEL: str = os.getenv("OLLAMA_VLM_MODEL", "qwen2.5-vl:7b")
 OLLAMA_TIMEOUT: float = float(os.getenv("OLLAMA_TIMEOUT", "120"))
+# How long Ollama keeps the VLM loaded after a request. Its default is 5m,
+# and reloading a 7B VLM costs seconds, so a burst of screenshots spread
+# over a quarter hour paid that load more than once.
+OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
 
 # ── Embeddings ───────────────────────────────────────────────────
 EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "bge-small-en-v1.5")
@@ -70,6 +74,11 @@ EXTRA_ALLOWED_ORIGINS: list[str] = [
     if origin.strip()
 ]
 
+# ── Storage ──────────────────────────────────────────────────────
+# Chat files are only ever read back by this backend, so they are written
+# compact. Set this to get indented files for reading or diffing by hand.
+PRETTY_JSON: bool = os.getenv("ORIGAMI_PRETTY_JSON", "") not in ("", "0", "false", "False")
+
 # ── Ingestion ────────────────────────────────────────────────────
 CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1200"))
 CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "300"))
@@ -80,6 +89,12 @@ CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "300"))
 # reader did not need.
 CONTEXTUALIZE_MIN_CHARS: int = int(os.getenv("ORIGAMI_CONTEXTUALIZE_MIN_CHARS", "600"))
 
+# A PDF chunk is a slice of a long document rather than a standalone
+# capture, so it keeps its blurb down to a much shorter length. Below this
+# it is a tail or a caption fragment, and gets a templated title-and-page
+# context instead of a model call.
+PDF_CONTEXTUALIZE_MIN_CHARS: int = int(os.getenv("ORIGAMI_PDF_CONTEXTUALIZE_MIN_CHARS", "200"))
+
 # How much of the source document is prepended to every contextualization
 # request. That prefix is byte-identical across a document's chunks, so it
 # is sent as a cacheable block; Anthropic's minimum cacheable prefix for
@@ -90,6 +105,11 @@ CONTEXTUALIZE_MIN_CHARS: int = int(os.getenv("ORIGAMI_CONTEXTUALIZE_MIN_CHARS",
 # tokenizes closer to 3 chars/token.
 CONTEXT_DOC_CHARS: int = int(os.getenv("CONTEXT_DOC_CHARS", "24000"))
 
+# How many uploaded PDFs are ingested at once. Each ingest embeds and
+# contextualizes every chunk, so a burst of uploads running side by side
+# only contends for the embedder and the Chroma writer; the rest wait.
+MAX_CONCURRENT_INGESTS: int = max(1, int(os.getenv("MAX_CONCURRENT_INGESTS", "2")))
+
 # ── Cost controls ────────────────────────────────────────────────
 MAX_LOOPS_CLAMP: int = 5
 
@@ -1,3 +1,5 @@
+import asyncio
+import importlib
 import logging
 import os
 import secrets
@@ -25,20 +27,41 @@ from fastapi.responses import JSONResponse
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
 
 from config import FRONTEND_URL, EXTRA_ALLOWED_ORIGINS, AUTH_TOKEN, MODEL_STUB
-from services.migrate import run_migrations
 from services.schema import SCHEMA_VERSION
-from routes.chat import router as chat_router
-from routes.chats import router as chats_router
-from routes.documents import router as documents_router
-from routes.library import router as library_router
-from routes.notes import router as notes_router
-from routes.upload import router as upload_router
-from routes.screenshots import router as screenshots_router
-from routes.snippets import router as snippets_router
-from routes.usage import router as usage_router
 
 logger = logging.getLogger(__name__)
 
+# The API routers pull in chromadb, LangGraph and LangChain, about two
+# seconds of imports. None of that is needed to bind the port and print
+# the ORIGAMI_PORT= line, so it happens after: run() starts the import on
+# a thread as soon as the line is out, and the lifespan waits for it. The
+# server does not answer /health until startup has finished, so the
+# sidecar's health poll still means "every route is mounted".
+_ROUTER_MODULES = (
+    "routes.chat",
+    "routes.chats",
+    "routes.documents",
+    "routes.library",
+    "routes.notes",
+    "routes.upload",
+    "routes.screenshots",
+    "routes.snippets",
+    "routes.usage",
+)
+_routers_lock = threading.Lock()
+_routers_mounted = False
+
+
+def _mount_routers() -> None:
+    """Import every API router and include it under /api. Idempotent."""
+    global _routers_mounted
+    with _routers_lock:
+        if _routers_mounted:
+            return
+        for name in _ROUTER_MODULES:
+            app.include_router(importlib.import_module(name).router, prefix="/api")
+        _routers_mounted = True
+
 
 def _migrate() -> None:
     """Bring a store that predates the Item/Segment schema onto v2.
@@ -57,10 +80,27 @@ def _migrate() -> None:
     An unmigrated record therefore reads as untrusted rather than as
     missing; it only looks stale to the re-embed job.
     """
+    from services.chroma import heads_by_filename, invalidate_heads, warm_index
+    from services.embeddings import warm_query_embedder
+    from services.migrate import run_migrations
+
     try:
         logger.info(f"Schema v{SCHEMA_VERSION} migration: {run_migrations()}")
     except Exception as exc:
         logger.error(f"Schema v{SCHEMA_VERSION} migration failed: {exc}", exc_info=True)
+    # The migration rewrites metadata in place. Rebuild the heads index
+    # here, so the first /pdfs after a restart does not pay for it.
+    invalidate_heads()
+    try:
+        heads_by_filename()
+    except Exception as exc:
+        logger.warning(f"Could not warm the document heads index: {exc}")
+    try:
+        warm_index()
+    except Exception as exc:
+        logger.warning(f"Could not warm the vector index: {exc}")
+    # Last, so the load does not compete with the migration for the CPU
+    warm_query_embedder()
 
 
 @asynccontextmanager
@@ -70,8 +110,12 @@ async def lifespan(app: FastAPI):
             "ORIGAMI_MODEL_STUB is set: every model call is answered from a local "
             "stub and no request reaches the API. Answers are not real."
         )
+    await asyncio.to_thread(_mount_routers)
     threading.Thread(target=_migrate, name="origami-migrate", daemon=True).start()
     yield
+    from services.vision import close_client
+
+    await close_client()
 
 
 app = FastAPI(title="Origami API", version="0.1.0", lifespan=lifespan)
@@ -109,17 +153,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(chat_router, prefix="/api")
-app.include_router(chats_router, prefix="/api")
-app.include_router(documents_router, prefix="/api")
-app.include_router(library_router, prefix="/api")
-app.include_router(notes_router, prefix="/api")
-app.include_router(upload_router, prefix="/api")
-app.include_router(screenshots_router, prefix="/api")
-app.include_router(snippets_router, prefix="/api")
-app.include_router(usage_router, prefix="/api")
-
-
 @app.get("/health")
 async def health():
     return {"status": "ok"}
@@ -145,6 +178,7 @@ def run() -> None:
     bound_port = sock.getsockname()[1]
     sys.stdout.write(f"ORIGAMI_PORT={bound_port}\n")
     sys.stdout.flush()
+    threading.Thread(target=_mount_routers, name="origami-routes", daemon=True).start()
 
     server = uvicorn.Server(uvicorn.Config(app, host=HOST, port=bound_port))
     server.run(sockets=[sock])
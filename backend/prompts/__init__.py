@@ -13,7 +13,7 @@ from prompts.final_response import (
     EDIT_ALLOWED_INSTRUCTION,
     EDIT_PROTOCOL,
 )
-from prompts.contextualizer import CONTEXTUALIZER_PROMPT
+from prompts.contextualizer import CONTEXTUALIZER_PROMPT, CONTEXTUALIZER_NEARBY_PROMPT
 from prompts.classify import CLASSIFY_PROMPT, FAST_FACT_PROMPT
 
 __all__ = [
@@ -25,6 +25,7 @@ __all__ = [
     "EDIT_ALLOWED_INSTRUCTION",
     "EDIT_PROTOCOL",
     "CONTEXTUALIZER_PROMPT",
+    "CONTEXTUALIZER_NEARBY_PROMPT",
     "CLASSIFY_PROMPT",
     "FAST_FACT_PROMPT",
 ]
@@ -1,10 +1,15 @@
 """Prompt for contextual retrieval — generates a compact context prefix for each PDF chunk."""
 
-CONTEXTUALIZER_PROMPT = """\
+# Shared by both templates below, so a document's chunks share one cached
+# prefix whichever template a chunk is rendered with.
+_DOCUMENT = """\
 <document>
 {whole_document}
 </document>
 
+"""
+
+_TASK = """\
 <chunk>
 {chunk_content}
 </chunk>
@@ -16,4 +21,18 @@ Rules:
 - Prefer concrete identifiers: section/topic, entities, method names, what is being defined/compared.
 - Do not evaluate (avoid “better/worse”, “improves”, etc.) unless explicitly stated in the chunk.
 - Output ONLY the context sentences. No bullets, no headings, no quotes, no extra text.
-"""
\ No newline at end of file
+"""
+
+CONTEXTUALIZER_PROMPT = _DOCUMENT + _TASK
+
+# For a chunk that starts past the truncated document above: the passage
+# around it, so it is situated by its real surroundings, not only the
+# document's opening.
+CONTEXTUALIZER_NEARBY_PROMPT = _DOCUMENT + """\
+The document above is cut short. The chunk comes from further in; this is the text around it, with the chunk itself marked:
+
+<nearby_text>
+{nearby_text}
+</nearby_text>
+
+""" + _TASK
@@ -1,16 +1,17 @@
-import json
 import logging
+import sys
 import time
 import uuid
 
+import orjson
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from langgraph.errors import GraphRecursionError
 
 from services.agent import stream_research_agent
-from services.chroma import resolve_tag
+from services.chroma import resolve_tag_many
 from services.llm import CallBudgetExceeded, ContextBudgetError
 
 router = APIRouter()
@@ -34,12 +35,19 @@ class ChatMessage(BaseModel):
     parts: list[ChatMessagePart] = []
     content: str | None = None
 
+    _text: str | None = PrivateAttr(default=None)
+
     def get_text(self) -> str:
-        if self.parts:
-            return " ".join(
-                p.text for p in self.parts if p.type == "text" and p.text
-            )
-        return self.content or ""
+        """The message's text parts, space-joined. Computed once per message."""
+        if self._text is None:
+            parts = self.parts
+            if not parts:
+                self._text = self.content or ""
+            elif len(parts) == 1:
+                self._text = parts[0].text if parts[0].type == "text" else ""
+            else:
+                self._text = " ".join([p.text for p in parts if p.type == "text" and p.text])
+        return self._text
 
 
 class ChatRequest(BaseModel):
@@ -55,23 +63,51 @@ class ChatRequest(BaseModel):
 # -- SSE helpers (AI SDK v6 JSON event stream) ------------------------------
 
 
-def _sse(data: dict) -> str:
-    """Format a single Server-Sent Event."""
-    return f"data: {json.dumps(data)}\n\n"
+def _sse(data: dict) -> bytes:
+    """Format a single Server-Sent Event, already UTF-8 encoded.
+
+    orjson emits bytes directly, so a frame is never held as a str and
+    re-encoded by Starlette on the way out.
+    """
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+# Event type names, interned once: every frame of every stream repeats
+# them, and interned keys let orjson and the dict machinery compare by
+# identity instead of by value.
+_T_REASONING_START = sys.intern("reasoning-start")
+_T_REASONING_DELTA = sys.intern("reasoning-delta")
+_T_TEXT_START = sys.intern("text-start")
+_T_TEXT_DELTA = sys.intern("text-delta")
+_T_TEXT_END = sys.intern("text-end")
+_T_DATA_ACTION = sys.intern("data-action")
+
+# Frames with no per-request content, encoded once at import.
+_START_FRAME = _sse({"type": "start"})
+_FINISH_FRAME = _sse({"type": "finish", "finishReason": "stop"})
+_DONE_FRAME = b"data: [DONE]\n\n"
 
+# An end frame varies only by part id, and every id is generated here
+# ("r-<n>" or a uuid4), so it can be spliced in without JSON escaping.
+_END_FRAME = b'data: {"type":"%s-end","id":"%s"}\n\n'
 
-def _reasoning_block(content: str, block_id: str, meta: dict | None = None) -> str:
+
+def _end_frame(kind: bytes, part_id: str) -> bytes:
+    return _END_FRAME % (kind, part_id.encode("ascii"))
+
+
+def _reasoning_block(content: str, block_id: str, meta: dict | None = None) -> bytes:
     """Emit a complete reasoning part (start + delta + end)."""
     # `is not None`, not truthiness: an empty meta dict is still a metadata
     # channel, and dropping the block on falsiness silently loses stats.
-    start_event: dict = {"type": "reasoning-start", "id": block_id}
+    start_event: dict = {"type": _T_REASONING_START, "id": block_id}
     if meta is not None:
         start_event["providerMetadata"] = {"origami": meta}
-    return (
-        _sse(start_event)
-        + _sse({"type": "reasoning-delta", "id": block_id, "delta": content})
-        + _sse({"type": "reasoning-end", "id": block_id})
-    )
+    return b"".join((
+        _sse(start_event),
+        _sse({"type": _T_REASONING_DELTA, "id": block_id, "delta": content}),
+        _end_frame(b"reasoning", block_id),
+    ))
 
 
 # -- Endpoint ---------------------------------------------------------------
@@ -86,27 +122,31 @@ async def chat(request: ChatRequest):
     (searching, reasoning, note-taking) as reasoning parts, then the final
     response as a text part.
     """
-    messages = [
-        {"role": m.role, "content": m.get_text()}
-        for m in request.messages
-    ]
-
-    # Resolve scope: tags (prefixed with #) become file_ids, UUIDs pass through
-    file_ids: list[str] = []
+    # Roles are a handful of values repeated down the whole history.
+    messages = [(sys.intern(m.role), m.get_text()) for m in request.messages]
+
+    # Resolve scope: tags (prefixed with #) become file_ids, UUIDs pass
+    # through. All tags resolve in one query, and a file reached through
+    # several tags (or named directly as well) is scoped once.
+    tags: list[str] = []
+    file_ids: set[str] = set()
     for entry in request.scope:
         if entry.startswith("#"):
-            file_ids.extend(resolve_tag(entry[1:]))
+            tags.append(entry[1:])
         else:
-            file_ids.append(entry)
-    resolved_scope = file_ids if file_ids else None
+            file_ids.add(entry)
+    file_ids |= resolve_tag_many(tags)
+    resolved_scope = sorted(file_ids) or None
 
     async def generate():
         t_start = time.perf_counter()
         logger.info("[LATENCY] request received — starting SSE stream")
-        yield _sse({"type": "start"})
+        yield _START_FRAME
 
         reasoning_counter = 0
         t_last_event = t_start
+        # The open text part while an answer is being streamed in deltas.
+        stream_text_id: str | None = None
 
         try:
             async for event in stream_research_agent(
@@ -121,24 +161,39 @@ async def chat(request: ChatRequest):
                 event_type = event["type"]
                 content = event["content"]
 
-                if event_type == "text":
+                if event_type == "text_delta":
+                    if stream_text_id is None:
+                        logger.info("[LATENCY] first answer token at +%.3fs", t_now - t_start)
+                        stream_text_id = str(uuid.uuid4())
+                        yield _sse({"type": _T_TEXT_START, "id": stream_text_id})
+                    yield _sse({"type": _T_TEXT_DELTA, "id": stream_text_id, "delta": content})
+                elif event_type == "text" and event.get("streamed") and stream_text_id is not None:
+                    # The deltas are already out; the stats only exist now,
+                    # so they ride on the part's end frame instead.
+                    logger.info("[LATENCY] streamed response done at +%.3fs", t_now - t_start)
+                    text_end: dict = {"type": _T_TEXT_END, "id": stream_text_id}
+                    if event.get("meta") is not None:
+                        text_end["providerMetadata"] = {"origami": event["meta"]}
+                    yield _sse(text_end)
+                    stream_text_id = None
+                elif event_type == "text":
                     # Final answer → text part with stats metadata
                     meta = event.get("meta")
                     logger.info("[LATENCY] final response at +%.3fs (gap %.3fs)",
                                 t_now - t_start, t_now - t_last_event)
                     text_id = str(uuid.uuid4())
-                    text_start: dict = {"type": "text-start", "id": text_id}
+                    text_start: dict = {"type": _T_TEXT_START, "id": text_id}
                     if meta is not None:
                         text_start["providerMetadata"] = {"origami": meta}
                     yield _sse(text_start)
-                    yield _sse({"type": "text-delta", "id": text_id, "delta": content})
-                    yield _sse({"type": "text-end", "id": text_id})
+                    yield _sse({"type": _T_TEXT_DELTA, "id": text_id, "delta": content})
+                    yield _end_frame(b"text", text_id)
                 elif event_type == "action":
                     # File action proposal → data part SSE
                     logger.info("[SSE] Emitting data-action: %s file=%s markdown_len=%d",
                                 content.get("action"), content.get("filename"), len(content.get("markdown", "")))
                     yield _sse({
-                        "type": "data-action",
+                        "type": _T_DATA_ACTION,
                         "id": str(uuid.uuid4()),
                         "data": content,
                     })
@@ -156,18 +211,20 @@ async def chat(request: ChatRequest):
             # too much, so the log is loud and the user gets a sentence
             # instead of a broken stream.
             logger.error("[COST] budget breach — turn aborted: %s", exc)
+            if stream_text_id is not None:
+                yield _end_frame(b"text", stream_text_id)
             text_id = str(uuid.uuid4())
-            yield _sse({"type": "text-start", "id": text_id})
-            yield _sse({"type": "text-delta", "id": text_id,
+            yield _sse({"type": _T_TEXT_START, "id": text_id})
+            yield _sse({"type": _T_TEXT_DELTA, "id": text_id,
                         "delta": "This turn hit its model-call limit and was stopped "
                                  "before finishing. Please try again."})
-            yield _sse({"type": "text-end", "id": text_id})
+            yield _end_frame(b"text", text_id)
 
         t_end = time.perf_counter()
         logger.info("[LATENCY] === SSE stream complete: %.3fs total, %d thought blocks ===",
                     t_end - t_start, reasoning_counter)
-        yield _sse({"type": "finish", "finishReason": "stop"})
-        yield "data: [DONE]\n\n"
+        yield _FINISH_FRAME
+        yield _DONE_FRAME
 
     return StreamingResponse(
         generate(),
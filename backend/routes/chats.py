@@ -1,19 +1,23 @@
 """API routes for managing chat instances."""
 
-import json
+import asyncio
+import os
 import uuid
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, ConfigDict
 
-from config import CHATS_DIR
+from config import CHATS_DIR, PRETTY_JSON
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+_DUMP_OPTIONS = orjson.OPT_INDENT_2 if PRETTY_JSON else 0
+
 
 class MessagePart(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -38,22 +42,45 @@ class CreateChatRequest(BaseModel):
 
 
 def _chat_path(chat_id: str) -> Path:
-    path = (CHATS_DIR / f"{chat_id}.json").resolve()
-    if not path.parent == CHATS_DIR.resolve():
+    # Ids are uuid4 hex prefixes. An ASCII-alphanumeric id cannot hold a
+    # separator or "..", so it cannot leave CHATS_DIR, and checking that
+    # costs no resolve() syscalls on every save.
+    if not (chat_id.isascii() and chat_id.isalnum() and len(chat_id) <= 32):
         raise HTTPException(status_code=400, detail="Invalid chat id")
-    return path
+    return CHATS_DIR / f"{chat_id}.json"
 
 
-def _read_chat(chat_id: str) -> dict:
+async def _read_chat(chat_id: str) -> dict:
     path = _chat_path(chat_id)
-    if not path.exists():
+    try:
+        raw = await asyncio.to_thread(path.read_bytes)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Chat not found")
-    return json.loads(path.read_text(encoding="utf-8"))
+    return orjson.loads(raw)
+
+
+def _replace_file(path: Path, payload: bytes) -> None:
+    """Write payload beside path, then rename it over path.
+
+    A reader, including the sidebar scan, sees either the old file or the
+    new one, never a truncated one, and a save that dies halfway leaves
+    the previous version intact. The temp name is unique per write, so
+    two saves of one chat cannot interleave into the same temp file, and
+    it does not end in .json, so the scan never picks it up.
+    """
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
-def _write_chat(chat_id: str, data: dict) -> None:
+async def _write_chat(chat_id: str, data: dict) -> None:
     path = _chat_path(chat_id)
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    await asyncio.to_thread(_replace_file, path, orjson.dumps(data, option=_DUMP_OPTIONS))
+    _invalidate_chats()
 
 
 def _extract_title(messages: list[dict]) -> str:
@@ -67,13 +94,41 @@ def _extract_title(messages: list[dict]) -> str:
     return "New Chat"
 
 
-@router.get("/chats")
-async def list_chats():
-    """List all chat instances."""
+# Sidebar listing, keyed on the chats directory's mtime. Creating or
+# deleting a chat file moves the directory mtime; rewriting one in place
+# does not, so every write here also bumps _chats_generation and a scan
+# that raced a write is not stored.
+_CHATS_CACHE: tuple[int, list[dict]] | None = None
+_chats_generation = 0
+
+
+def _invalidate_chats() -> None:
+    global _CHATS_CACHE, _chats_generation
+    _CHATS_CACHE = None
+    _chats_generation += 1
+
+
+def _list_chats_cached() -> list[dict]:
+    global _CHATS_CACHE
+    mtime_ns = CHATS_DIR.stat().st_mtime_ns
+    cached = _CHATS_CACHE
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    generation = _chats_generation
+    chats = _scan_chats()
+    if generation == _chats_generation:
+        _CHATS_CACHE = (mtime_ns, chats)
+    return chats
+
+
+def _scan_chats() -> list[dict]:
     chats = []
-    for path in CHATS_DIR.glob("*.json"):
+    with os.scandir(CHATS_DIR) as entries:
+        paths = [entry.path for entry in entries if entry.name.endswith(".json")]
+    for path in paths:
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
             chats.append({
                 "id": data["id"],
                 "title": data.get("title", "New Chat"),
@@ -81,12 +136,18 @@ async def list_chats():
                 "updated_at": data.get("updated_at", ""),
                 "message_count": len(data.get("messages", [])),
             })
-        except (json.JSONDecodeError, KeyError):
+        except (OSError, orjson.JSONDecodeError, KeyError):
             continue
     chats.sort(key=lambda c: c["updated_at"], reverse=True)
     return chats
 
 
+@router.get("/chats")
+async def list_chats():
+    """List all chat instances."""
+    return await asyncio.to_thread(_list_chats_cached)
+
+
 @router.post("/chats")
 async def create_chat(req: CreateChatRequest):
     """Create a new chat instance."""
@@ -99,7 +160,7 @@ async def create_chat(req: CreateChatRequest):
         "updated_at": now,
         "messages": [],
     }
-    _write_chat(chat_id, data)
+    await _write_chat(chat_id, data)
     logger.info(f"Created chat {chat_id}: {req.title}")
     return {"id": chat_id, "title": req.title}
 
@@ -107,13 +168,13 @@ async def create_chat(req: CreateChatRequest):
 @router.get("/chats/{chat_id}")
 async def get_chat(chat_id: str):
     """Get a chat instance with all messages."""
-    return _read_chat(chat_id)
+    return await _read_chat(chat_id)
 
 
 @router.put("/chats/{chat_id}")
 async def update_chat(chat_id: str, req: SaveChatRequest):
     """Save messages to a chat instance."""
-    data = _read_chat(chat_id)
+    data = await _read_chat(chat_id)
     now = datetime.now(timezone.utc).isoformat()
 
     # Filter to only text/reasoning parts
@@ -138,7 +199,7 @@ async def update_chat(chat_id: str, req: SaveChatRequest):
     elif not data.get("title") or data["title"] == "New Chat":
         data["title"] = _extract_title(filtered_messages)
 
-    _write_chat(chat_id, data)
+    await _write_chat(chat_id, data)
     return {"id": chat_id, "title": data["title"], "updated_at": now}
 
 
@@ -149,5 +210,6 @@ async def delete_chat(chat_id: str):
     if not path.exists():
         raise HTTPException(status_code=404, detail="Chat not found")
     path.unlink()
+    _invalidate_chats()
     logger.info(f"Deleted chat {chat_id}")
     return {"deleted": True}
@@ -6,7 +6,15 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from config import DATA_DIR, PDFS_DIR
-from services.chroma import get_collection, get_document_meta, set_tags, set_title, delete_chunks
+from services.chroma import (
+    delete_chunks,
+    get_collection,
+    get_document_meta,
+    list_document_metas,
+    set_tags,
+    set_title,
+    update_document_meta,
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -20,34 +28,15 @@ class TitleRequest(BaseModel):
     title: str
 
 
+class DocumentUpdate(BaseModel):
+    title: str | None = None
+    tags: list[str] | None = None
+
+
 @router.get("/documents")
 async def list_documents():
     """List unique documents stored in ChromaDB, grouped by file_id."""
-    collection = get_collection()
-    if collection.count() == 0:
-        return []
-
-    result = collection.get(include=["metadatas"])
-
-    # Group chunks by file_id
-    docs: dict[str, dict] = {}
-    for meta in result["metadatas"] or []:
-        fid = meta.get("file_id", "")
-        if fid not in docs:
-            docs[fid] = {
-                "file_id": fid,
-                "filename": meta.get("filename", "unknown"),
-                "title": meta.get("title", meta.get("filename", "unknown")),
-                # The list is no longer PDFs only, and the renderer has to
-                # tell sources apart to know which ones the reader opens.
-                "source_type": meta.get("source_type", "pdf"),
-                "chunk_count": 0,
-                "tags": meta.get("tags", []),
-                "publish_date": meta.get("publish_date") or None,
-            }
-        docs[fid]["chunk_count"] += 1
-
-    return list(docs.values())
+    return list_document_metas()
 
 
 @router.get("/documents/{file_id}/chunks")
@@ -61,19 +50,22 @@ async def get_document_chunks(file_id: str):
     if not result["ids"]:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    chunks = []
-    for i, chunk_id in enumerate(result["ids"]):
-        meta = result["metadatas"][i]
-        chunks.append({
-            "chunk_id": chunk_id,
-            "chunk_index": meta.get("chunk_index", i),
-            "text": result["documents"][i] if result["documents"] else "",
-            "original_text": meta.get("original_chunk", ""),
-            "page_start": meta.get("page_start"),
-            "page_end": meta.get("page_end"),
-        })
-    chunks.sort(key=lambda c: c["chunk_index"])
-    return chunks
+    ids = result["ids"]
+    metadatas = result["metadatas"]
+    documents = result["documents"]
+    # Sort positions by ordinal first, then build each row once in order.
+    ordinals = [meta.get("chunk_index", i) for i, meta in enumerate(metadatas)]
+    return [
+        {
+            "chunk_id": ids[i],
+            "chunk_index": ordinals[i],
+            "text": documents[i] if documents else "",
+            "original_text": metadatas[i].get("original_chunk", ""),
+            "page_start": metadatas[i].get("page_start"),
+            "page_end": metadatas[i].get("page_end"),
+        }
+        for i in sorted(range(len(ids)), key=ordinals.__getitem__)
+    ]
 
 
 @router.patch("/documents/{file_id}/tags")
@@ -92,6 +84,18 @@ async def update_title(file_id: str, req: TitleRequest):
     return {"file_id": file_id, "title": req.title}
 
 
+@router.patch("/documents/{file_id}")
+async def update_document(file_id: str, req: DocumentUpdate):
+    """Set title and/or tags for a document in one store update."""
+    fields = req.model_dump(exclude_none=True)
+    if "tags" in fields:
+        # Same empty-list handling as set_tags
+        fields["tags"] = fields["tags"] or None
+    if not update_document_meta(file_id, **fields):
+        raise HTTPException(status_code=404, detail="Document not found")
+    return {"file_id": file_id, **req.model_dump(exclude_none=True)}
+
+
 @router.delete("/documents/{file_id}")
 async def delete_document(file_id: str):
     """Delete everything for a document: its segments and its raw bytes."""
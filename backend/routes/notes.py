@@ -1,8 +1,14 @@
 """API routes for managing local markdown notes."""
 
+import asyncio
+import mmap
+import os
+import re
 import uuid
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
@@ -22,12 +28,23 @@ class UpdateNoteRequest(BaseModel):
     content: str
 
 
-def _extract_title(content: str, filename: str = "") -> str:
-    """Extract the first # heading as the title, fall back to filename stem."""
-    for line in content.split("\n"):
-        stripped = line.strip()
-        if stripped.startswith("# "):
-            return stripped[2:].strip()
+class NoteSummary(BaseModel):
+    id: str
+    title: str
+    updated_at: datetime
+
+
+# The first line that, once stripped, reads "# <text>". Matched in one
+# scan that stops at the heading, rather than splitting the whole note.
+_TITLE_RE = re.compile(r"^[^\S\n]*# (?=[^\n]*\S)([^\n]*)", re.MULTILINE)
+
+
+# The same scan over raw UTF-8, for reading a title straight out of a
+# mapped file. Whitespace classes here are ASCII-only.
+_TITLE_BYTES_RE = re.compile(rb"^[^\S\n]*# (?=[^\n]*\S)([^\n]*)", re.MULTILINE)
+
+
+def _fallback_title(filename: str) -> str:
     # Use filename (without .md) if no heading found
     if filename:
         stem = filename.rsplit(".", 1)[0] if "." in filename else filename
@@ -36,60 +53,175 @@ def _extract_title(content: str, filename: str = "") -> str:
     return "Untitled"
 
 
+def _extract_title(content: str, filename: str = "") -> str:
+    """Extract the first # heading as the title, fall back to filename stem."""
+    m = _TITLE_RE.search(content)
+    if m:
+        return m.group(1).strip()
+    return _fallback_title(filename)
+
+
+def _read_title(path: str | Path, filename: str) -> str:
+    """_extract_title for a note on disk, without reading it into memory.
+
+    The file is mapped and scanned as bytes, so only the pages up to the
+    heading are touched and only the heading line is decoded.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _fallback_title(filename)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            m = _TITLE_BYTES_RE.search(mm)
+            if m:
+                return m.group(1).decode("utf-8", errors="replace").strip()
+    return _fallback_title(filename)
+
+
+# Note titles by filename, tagged with the st_mtime_ns they were parsed
+# from. A listing stats every note but only reads the ones whose mtime
+# moved; the write helpers below store the new title as they write, so
+# the app's own edits never cost a re-read either.
+_title_cache: dict[str, tuple[int, str]] = {}
+
+
+def _remember_title(path: Path, title: str) -> None:
+    _title_cache[path.name] = (path.stat().st_mtime_ns, title)
+
+
+_NOTES_DIR_RESOLVED = NOTES_DIR.resolve()
+
+# Every id the app mints (uuid4 hex, "research", and the dashed uuid4
+# strings of notes created before that) is a single plain path component,
+# which cannot leave NOTES_DIR; only other ids pay for resolve().
+_PLAIN_NOTE_ID_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+
+
 def _note_path(note_id: str) -> Path:
+    if _PLAIN_NOTE_ID_RE.fullmatch(note_id):
+        return _NOTES_DIR_RESOLVED / f"{note_id}.md"
     path = (NOTES_DIR / f"{note_id}.md").resolve()
-    if not path.parent == NOTES_DIR.resolve():
+    if not path.parent == _NOTES_DIR_RESOLVED:
         raise HTTPException(status_code=400, detail="Invalid note id")
     return path
 
 
 # -- Importable write helpers (used by agent.py) ----------------------------
 
+# Note writes run here rather than on the event loop. A small dedicated
+# pool keeps a burst of saves from queueing behind (or crowding out) the
+# default executor's other work, and caps how many hit the disk at once.
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="notes-io")
+
+
+async def run_note_io(fn, *args):
+    """Run one of the blocking note helpers on the notes I/O pool."""
+    return await asyncio.get_running_loop().run_in_executor(_io_pool, fn, *args)
+
 
 def create_note_file(title: str) -> dict:
     """Create a new note file on disk. Returns {id, title, updated_at}."""
-    note_id = str(uuid.uuid4())
+    note_id = uuid.uuid4().hex
     path = NOTES_DIR / f"{note_id}.md"
     content = f"# {title}\n\n"
     path.write_text(content, encoding="utf-8")
+    _remember_title(path, title)
     updated_at = datetime.now(timezone.utc).isoformat()
     logger.info("Created note %s: %s", note_id, title)
     return {"id": note_id, "title": title, "updated_at": updated_at}
 
 
+# Bytes read per step when walking back over a note's trailing whitespace.
+_TAIL_WINDOW = 4096
+
+
+def _content_end(f) -> int:
+    """Offset just past the last non-whitespace byte of a binary file."""
+    end = f.seek(0, os.SEEK_END)
+    while end > 0:
+        start = max(0, end - _TAIL_WINDOW)
+        f.seek(start)
+        kept = f.read(end - start).rstrip()
+        if kept:
+            return start + len(kept)
+        end = start
+    return 0
+
+
 def append_to_note(note_id: str, markdown: str) -> dict:
-    """Append markdown to an existing note. Returns {id, title, content, updated_at}."""
+    """Append markdown to an existing note. Returns {id, title, updated_at}.
+
+    Only the note's tail is touched: trailing whitespace is truncated and
+    the new block written after it, instead of reading and rewriting the
+    whole file.
+    """
     path = NOTES_DIR / f"{note_id}.md"
     if not path.exists():
         raise FileNotFoundError(f"Note {note_id} not found")
-    existing = path.read_text(encoding="utf-8")
-    updated = existing.rstrip() + "\n\n" + markdown
-    path.write_text(updated, encoding="utf-8")
-    title = _extract_title(updated, path.name)
+    cached = _title_cache.get(path.name)
+    if cached is not None and cached[0] != path.stat().st_mtime_ns:
+        cached = None
+    with path.open("r+b") as f:
+        end = _content_end(f)
+        f.truncate(end)
+        f.seek(end)
+        f.write(("\n\n" + markdown).encode("utf-8"))
+    # An appended block can't displace an existing heading, so a known
+    # title stands. A note without one may have just gained one.
+    if cached is not None and cached[1] != _fallback_title(path.name):
+        title = cached[1]
+    else:
+        title = _read_title(path, path.name)
+    _remember_title(path, title)
     updated_at = datetime.now(timezone.utc).isoformat()
     logger.info("Appended to note %s (%d chars)", note_id, len(markdown))
-    return {"id": note_id, "title": title, "content": updated, "updated_at": updated_at}
+    return {"id": note_id, "title": title, "updated_at": updated_at}
+
+
+def _overwrite_note(path: Path, content: str) -> str:
+    """Replace a note's content. Returns its title."""
+    path.write_text(content, encoding="utf-8")
+    title = _extract_title(content, path.name)
+    _remember_title(path, title)
+    return title
+
+
+def _load_note_summary(entry: os.DirEntry) -> tuple[float, str, str]:
+    stat = entry.stat()
+    cached = _title_cache.get(entry.name)
+    if cached is not None and cached[0] == stat.st_mtime_ns:
+        title = cached[1]
+    else:
+        title = _read_title(entry.path, entry.name)
+        _title_cache[entry.name] = (stat.st_mtime_ns, title)
+    return stat.st_mtime, entry.name[:-3], title
 
 
-@router.get("/notes")
+@router.get("/notes", response_model=list[NoteSummary])
 async def list_notes():
     """List all saved notes with id, title, and updated_at."""
-    notes = []
-    for path in NOTES_DIR.glob("*.md"):
-        note_id = path.stem
-        content = path.read_text(encoding="utf-8")
-        title = _extract_title(content, path.name)
-        stat = path.stat()
-        notes.append({
-            "id": note_id,
-            "title": title,
-            "updated_at": datetime.fromtimestamp(
-                stat.st_mtime, tz=timezone.utc
-            ).isoformat(),
-        })
-    # Most recently updated first
-    notes.sort(key=lambda n: n["updated_at"], reverse=True)
-    return notes
+    # Each read runs on a worker thread, so the event loop keeps serving
+    # while the disk reads overlap.
+    with os.scandir(NOTES_DIR) as it:
+        entries = [e for e in it if e.name.endswith(".md") and e.is_file()]
+    summaries = list(await asyncio.gather(*(
+        asyncio.to_thread(_load_note_summary, entry) for entry in entries
+    )))
+    # Drop titles of notes removed behind the app's back.
+    present = {entry.name for entry in entries}
+    for name in _title_cache.keys() - present:
+        _title_cache.pop(name, None)
+    # Most recently updated first, comparing the raw mtimes. The response
+    # model serializes straight to JSON bytes, formatting the timestamps
+    # along the way.
+    summaries.sort(key=itemgetter(0), reverse=True)
+    return [
+        NoteSummary(
+            id=note_id,
+            title=title,
+            updated_at=datetime.fromtimestamp(mtime, tz=timezone.utc),
+        )
+        for mtime, note_id, title in summaries
+    ]
 
 
 @router.get("/notes/{note_id}")
@@ -104,7 +236,7 @@ async def get_note(note_id: str):
 @router.post("/notes")
 async def create_note(req: CreateNoteRequest):
     """Create a new note with a title."""
-    result = create_note_file(req.title)
+    result = await run_note_io(create_note_file, req.title)
     return {"id": result["id"], "title": result["title"]}
 
 
@@ -114,8 +246,7 @@ async def update_note(note_id: str, req: UpdateNoteRequest):
     path = _note_path(note_id)
     if not path.exists():
         raise HTTPException(status_code=404, detail="Note not found")
-    path.write_text(req.content, encoding="utf-8")
-    title = _extract_title(req.content, path.name)
+    title = await run_note_io(_overwrite_note, path, req.content)
     return {"id": note_id, "title": title}
 
 
@@ -126,5 +257,6 @@ async def delete_note(note_id: str):
     if not path.exists():
         raise HTTPException(status_code=404, detail="Note not found")
     path.unlink()
+    _title_cache.pop(path.name, None)
     logger.info(f"Deleted note {note_id}")
     return {"deleted": True}
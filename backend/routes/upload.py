@@ -1,16 +1,28 @@
+import asyncio
+import errno
+import os
 import shutil
 import uuid
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
 
-from fastapi import APIRouter, UploadFile, File, BackgroundTasks, HTTPException
+from fastapi import APIRouter, UploadFile, File, BackgroundTasks, HTTPException, Request
 from pydantic import BaseModel
-from starlette.responses import FileResponse
-
-from config import UPLOADS_DIR, PDFS_DIR
-from services.ingest import ingest_pdf, generate_title_from_pdf, extract_text_from_pdf, extract_publish_date, text_splitter
-from services.chroma import hash_bytes, find_by_hash, list_all_tags, save_tag, get_collection
+from starlette.responses import FileResponse, Response
+
+from config import UPLOADS_DIR, PDFS_DIR, MAX_CONCURRENT_INGESTS
+from services.ingest import ingest_pdf, generate_title_from_pdf, extract_publish_date
+from services.chroma import (
+    content_hasher,
+    find_by_hash,
+    get_collection,
+    hash_file,
+    heads_by_filename,
+    invalidate_heads,
+    list_all_tags,
+    save_tag,
+)
 from services.schema import Item, data_relative, provenance_for_upload
 from services.text_utils import sanitize_filename
 
@@ -28,27 +40,87 @@ class CreateTagRequest(BaseModel):
     tag: str
 
 
+class PersistedPdf(BaseModel):
+    name: str
+    filename: str
+    size: int
+    uploaded_at: datetime
+    # Only set once the PDF has segments in the store.
+    file_id: str | None = None
+    title: str | None = None
+    tags: list[str] | None = None
+
+
+# Caps how many background ingests run at once; confirmed uploads past the
+# cap wait here instead of all embedding and writing at the same time.
+_ingest_sem = asyncio.Semaphore(MAX_CONCURRENT_INGESTS)
+
+
 async def _process_pdf(
     file_id: str, file_path: Path, filename: str,
     tags: list[str], content_hash: str, title: str = "",
 ) -> None:
     """Background task: run the contextual retrieval ingestion pipeline."""
+    async with _ingest_sem:
+        try:
+            publish_date = extract_publish_date(file_path)
+            item = Item(
+                id=file_id,
+                source_type="pdf",
+                source_id=content_hash,
+                title=title or filename,
+                created_at=publish_date or "",
+                ingested_at=datetime.now(timezone.utc).isoformat(),
+                provenance=provenance_for_upload(),
+                raw_ref=data_relative(file_path),
+            )
+            count = await ingest_pdf(file_path, item, tags=tags)
+            logger.info(f"Finished ingesting {filename}: {count} chunks (publish_date={publish_date})")
+        except Exception as e:
+            logger.exception(f"Ingestion failed for {filename}: {e}")
+
+
+# Bytes per read while streaming an upload to disk.
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+async def _save_upload(file: UploadFile, path: Path) -> tuple[int, str]:
+    """Stream an upload to path, hashing as it goes. Returns (size, sha256).
+
+    One pass over the bytes with at most one chunk in memory, where
+    reading the whole upload first held the entire PDF and then walked
+    it twice more to write and to hash it.
+    """
+    hasher = content_hasher()
+    size = 0
+    with path.open("wb") as out:
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            size += len(chunk)
+            await asyncio.to_thread(out.write, chunk)
+    return size, hasher.hexdigest()
+
+
+def _hash_path(file_id: str) -> Path:
+    return UPLOADS_DIR / f"{file_id}.sha256"
+
+
+def _take_upload_hash(file_id: str, path: Path) -> str:
+    """The content hash recorded when the upload landed, consuming the record.
+
+    /upload already hashed these bytes, so confirm reads the 64-byte
+    record rather than the whole PDF. It is kept server-side instead of
+    taken from the confirm request because content_hash is the dedup key
+    and the client has no business choosing it. An upload from before
+    the record existed is hashed from disk as before.
+    """
+    record = _hash_path(file_id)
     try:
-        publish_date = extract_publish_date(file_path)
-        item = Item(
-            id=file_id,
-            source_type="pdf",
-            source_id=content_hash,
-            title=title or filename,
-            created_at=publish_date or "",
-            ingested_at=datetime.now(timezone.utc).isoformat(),
-            provenance=provenance_for_upload(),
-            raw_ref=data_relative(file_path),
-        )
-        count = await ingest_pdf(file_path, item, tags=tags)
-        logger.info(f"Finished ingesting {filename}: {count} chunks (publish_date={publish_date})")
-    except Exception as e:
-        logger.exception(f"Ingestion failed for {filename}: {e}")
+        content_hash = record.read_text(encoding="ascii").strip()
+    except FileNotFoundError:
+        return hash_file(path)
+    record.unlink(missing_ok=True)
+    return content_hash
 
 
 @router.post("/upload")
@@ -57,13 +129,10 @@ async def upload_pdf(file: UploadFile = File(...)):
 
     Does NOT start ingestion -- call /api/upload/confirm to finalize.
     """
-    file_id = str(uuid.uuid4())
+    file_id = uuid.uuid4().hex
     file_path = UPLOADS_DIR / f"{file_id}.pdf"
 
-    content = await file.read()
-    file_path.write_bytes(content)
-
-    content_hash = hash_bytes(content)
+    size, content_hash = await _save_upload(file, file_path)
 
     # Check for duplicate in ChromaDB
     existing = find_by_hash(content_hash)
@@ -75,6 +144,7 @@ async def upload_pdf(file: UploadFile = File(...)):
             "duplicate": True,
             "status": "duplicate",
         }
+    _hash_path(file_id).write_text(content_hash, encoding="ascii")
 
     suggested_title = generate_title_from_pdf(file_path)
     safe_name = sanitize_filename(suggested_title)
@@ -84,7 +154,7 @@ async def upload_pdf(file: UploadFile = File(...)):
         "filename": file.filename,
         "suggested_name": safe_name,
         "suggested_title": suggested_title,
-        "size": len(content),
+        "size": size,
         "content_hash": content_hash,
         "status": "pending_confirmation",
     }
@@ -101,24 +171,31 @@ async def confirm_upload(req: ConfirmRequest, background_tasks: BackgroundTasks)
     if not safe_name:
         safe_name = "untitled"
 
-    # Handle name collisions
-    final_path = PDFS_DIR / f"{safe_name}.pdf"
+    # Handle name collisions against one read of pdfs/, rather than a
+    # stat per candidate name
+    with os.scandir(PDFS_DIR) as it:
+        taken = {e.name for e in it}
+    final_filename = f"{safe_name}.pdf"
     counter = 1
-    while final_path.exists():
-        final_path = PDFS_DIR / f"{safe_name}-{counter}.pdf"
+    while final_filename in taken:
+        final_filename = f"{safe_name}-{counter}.pdf"
         counter += 1
 
+    final_path = PDFS_DIR / final_filename
     final_name = final_path.stem
 
-    shutil.copy2(str(temp_path), str(final_path))
-    temp_path.unlink()
-
-    # Pre-compute chunk count so frontend can track real progress
-    full_text, _page_offsets = extract_text_from_pdf(final_path)
-    chunks = text_splitter.split_text(full_text) if full_text.strip() else []
+    # uploads/ and pdfs/ both live under DATA_DIR, so this is normally one
+    # rename rather than a byte-for-byte copy of the whole PDF.
+    try:
+        os.replace(temp_path, final_path)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        shutil.copy2(temp_path, final_path)
+        temp_path.unlink()
 
     file_id = req.id
-    content_hash = hash_bytes(final_path.read_bytes())
+    content_hash = _take_upload_hash(file_id, final_path)
 
     # The user-facing title is the raw name before sanitization
     title = req.name.strip() or "Untitled"
@@ -133,7 +210,11 @@ async def confirm_upload(req: ConfirmRequest, background_tasks: BackgroundTasks)
         "id": file_id,
         "filename": f"{final_name}.pdf",
         "size": final_path.stat().st_size,
-        "total_chunks": len(chunks),
+        # Not known until the background ingest has split the text. Every
+        # stored segment carries segment_total, which /documents reports,
+        # so the renderer reads the expected count from there instead of
+        # this handler extracting and splitting the whole PDF up front.
+        "total_chunks": None,
         "tags": req.tags,
         "status": "processing",
     }
@@ -155,14 +236,24 @@ async def create_tag(req: CreateTagRequest):
     return {"tag": tag}
 
 
-@router.get("/pdfs")
-async def list_pdfs():
-    """List all persisted PDFs from the pdfs/ directory."""
-    # Build filename -> metadata lookup from ChromaDB
+def _pdf_metadata(filenames: set[str]) -> dict[str, dict]:
+    """filename -> {file_id, title, tags} for the PDFs that are in the store.
+
+    The in-memory heads index covers almost every file without touching
+    the store. A file it misses, either a record written without
+    chunk_index or an ingest still short of its first segment, gets one
+    limit=1 lookup of its own, so the listing never scans every chunk.
+    """
+    if not filenames:
+        return {}
+    heads = heads_by_filename()
+    metas = [heads[filename] for filename in filenames if filename in heads]
     col = get_collection()
-    all_meta = col.get(include=["metadatas"])["metadatas"] or [] if col.count() > 0 else []
+    for filename in filenames - heads.keys():
+        metas.extend(col.get(where={"filename": filename}, include=["metadatas"], limit=1)["metadatas"] or [])
+
     filename_map: dict[str, dict] = {}
-    for meta in all_meta:
+    for meta in metas:
         fn = meta.get("filename", "")
         if fn and fn not in filename_map:
             filename_map[fn] = {
@@ -170,35 +261,63 @@ async def list_pdfs():
                 "title": meta.get("title", fn),
                 "tags": meta.get("tags", []),
             }
+    return filename_map
+
+
+@router.get("/pdfs", response_model=list[PersistedPdf], response_model_exclude_unset=True)
+async def list_pdfs():
+    """List all persisted PDFs from the pdfs/ directory."""
+    with os.scandir(PDFS_DIR) as it:
+        files = [e for e in it if e.name.endswith(".pdf") and e.is_file()]
+    filename_map = _pdf_metadata({f.name for f in files})
+
+    stats = [(f.stat(), f.name) for f in files]
+    # Newest first on the raw mtimes. The response model serializes straight
+    # to JSON bytes, formatting the timestamps along the way.
+    stats.sort(key=lambda s: s[0].st_mtime, reverse=True)
 
     pdfs = []
-    for path in PDFS_DIR.glob("*.pdf"):
-        stat = path.stat()
-        entry = {
-            "name": path.stem,
-            "filename": path.name,
-            "size": stat.st_size,
-            "uploaded_at": datetime.fromtimestamp(
-                stat.st_mtime, tz=timezone.utc
-            ).isoformat(),
-        }
-        chroma_info = filename_map.get(path.name)
+    for stat, filename in stats:
+        entry = PersistedPdf(
+            name=filename[:-4],
+            filename=filename,
+            size=stat.st_size,
+            uploaded_at=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+        )
+        chroma_info = filename_map.get(filename)
         if chroma_info:
-            entry["file_id"] = chroma_info["file_id"]
-            entry["title"] = chroma_info["title"]
-            entry["tags"] = chroma_info["tags"]
+            entry.file_id = chroma_info["file_id"]
+            entry.title = chroma_info["title"]
+            entry.tags = chroma_info["tags"]
         pdfs.append(entry)
-    pdfs.sort(key=lambda p: p["uploaded_at"], reverse=True)
     return pdfs
 
 
 @router.get("/pdfs/{name}/file")
-async def get_pdf_file(name: str):
+async def get_pdf_file(name: str, request: Request):
     """Serve the raw PDF file for the in-app reader."""
     pdf_path = PDFS_DIR / f"{name}.pdf"
-    if not pdf_path.exists():
+    # One stat serves both the existence check and the response headers,
+    # which FileResponse would otherwise stat for again.
+    try:
+        stat_result = os.stat(pdf_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="PDF not found")
-    return FileResponse(pdf_path, media_type="application/pdf")
+    # A name is reused when a PDF is deleted and uploaded again, so the
+    # reader may keep its copy but must revalidate it; the ETag (mtime and
+    # size) answers that with a bodiless 304 while the file is unchanged.
+    response = FileResponse(
+        pdf_path,
+        media_type="application/pdf",
+        stat_result=stat_result,
+        headers={"Cache-Control": "no-cache"},
+    )
+    if request.headers.get("if-none-match") == response.headers["etag"]:
+        return Response(status_code=304, headers={
+            "ETag": response.headers["etag"],
+            "Cache-Control": "no-cache",
+        })
+    return response
 
 
 @router.delete("/pdfs/{name}")
@@ -206,16 +325,15 @@ async def delete_pdf(name: str):
     """Delete a PDF and its associated ChromaDB chunks."""
     pdf_filename = f"{name}.pdf"
 
-    # Find file_id from ChromaDB by matching filename
+    # The ids are fetched first because the locked chromadb's delete()
+    # returns None rather than a count of what it removed.
     col = get_collection()
-    deleted_chunks = 0
-    if col.count() > 0:
-        results = col.get(where={"filename": pdf_filename}, include=[])
-        chunk_ids = results["ids"]
-        if chunk_ids:
-            col.delete(ids=chunk_ids)
-            deleted_chunks = len(chunk_ids)
-            logger.info(f"Deleted {deleted_chunks} chunks for {pdf_filename}")
+    chunk_ids = col.get(where={"filename": pdf_filename}, include=[])["ids"]
+    deleted_chunks = len(chunk_ids)
+    if chunk_ids:
+        col.delete(ids=chunk_ids)
+        invalidate_heads()
+        logger.info(f"Deleted {deleted_chunks} chunks for {pdf_filename}")
 
     # Delete PDF file
     pdf_path = PDFS_DIR / pdf_filename
@@ -9,7 +9,6 @@ Graph flow:
 """
 
 import asyncio
-import json
 import logging
 import re
 import time
@@ -17,6 +16,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, TypedDict
 
+import orjson
 from langgraph.graph import StateGraph, END
 
 from prompts import (
@@ -30,11 +30,12 @@ from prompts import (
     FINAL_RESPONSE_WITH_ACTIONS_PROMPT,
     REVIEW_PROMPT,
 )
-from routes.notes import create_note_file, append_to_note
+from routes.notes import create_note_file, append_to_note, run_note_io
 from services.rag import vector_search
 from config import LOOPS_BY_ROUTE, NOTES_DIR
 from services import usage
-from services.llm import Budget, ModelResult, Prompt, Purpose, complete
+from services.llm import Budget, ModelResult, Prompt, Purpose, complete, stream_complete
+from services.text_utils import ThinkTagFilter
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +47,18 @@ DEFAULT_MAX_LOOPS = 1
 # Runaway guard on the notes accumulator, not a compaction target.
 NOTES_CAP = 60
 
+# Runaway guards on what one excerpt or one note adds to every later
+# prompt. A default ingest never reaches them (segments are CHUNK_SIZE,
+# 1200 chars, and a finding is a sentence or two); they bind on a raised
+# CHUNK_SIZE, an overlong VLM caption, or a reply that writes paragraphs
+# as bullets.
+EXCERPT_CHARS = 3000
+NOTE_CHARS = 600
+
+# Appends up to this size are written on the event loop (no fsync, so the
+# cost is a buffered write into the page cache).
+_INLINE_NOTES_WRITE_CHARS = 8192
+
 # Short greetings and tokens that are always FAST_FACT without an LLM call
 _FAST_FACT_TOKENS = frozenset({
     "hi", "hello", "hey", "thanks", "thank you", "ok", "okay", "sure",
@@ -55,7 +68,8 @@ _FAST_FACT_TOKENS = frozenset({
 
 class ResearchState(TypedDict):
     """State passed through the research agent graph."""
-    messages: list[dict[str, str]]
+    # (role, text) pairs, oldest first.
+    messages: list[tuple[str, str]]
     current_note: str
     current_query: str
     research_notes: list[str]
@@ -74,6 +88,9 @@ class ResearchState(TypedDict):
     active_note_title: str
     active_note_id: str | None
     scope: list[str] | None
+    # The first retrieval, started before the route was known. retrieve_node
+    # takes it on the first loop and clears it.
+    prefetch: asyncio.Task | None
     # Routing
     route: str          # "fast_fact" | "normal_rag" | "deep_research"
     max_loops: int      # per-route cap passed into review_node
@@ -109,6 +126,25 @@ def _note_key(note: str) -> str:
     return " ".join(note.split()).casefold()
 
 
+def _extract_notes(analysis: str) -> list[str]:
+    """Bullet points of an analyze reply, one note each, markers removed.
+
+    Lines of ten characters or fewer are headings or stray markers, never a
+    finding. Each note is clipped to NOTE_CHARS, because every note is
+    re-sent in every later prompt of the turn.
+    """
+    return [
+        line.lstrip("- \u2022*").strip()[:NOTE_CHARS]
+        for line in analysis.strip().split("\n")
+        if len(line.strip()) > 10
+    ]
+
+
+def _bulleted(notes: list[str]) -> str:
+    """Notes as a markdown list, one "- " line each, for prompts and files."""
+    return "- " + "\n- ".join(notes) if notes else ""
+
+
 def _merge_notes(existing: list[str], candidates: list[str]) -> list[str]:
     """Drop exact duplicates and cap runaway growth.
 
@@ -223,9 +259,12 @@ def _excerpt_block(index: int, chunk: dict[str, Any]) -> str:
         if chunk["content_source"] == "generated"
         else "verbatim from the source"
     )
+    text = chunk["text"]
+    if len(text) > EXCERPT_CHARS:
+        text = text[:EXCERPT_CHARS] + " […]"
     return (
         f"[{index}] {chunk['source']} ({chunk['source_type']}) — {noun}, {authored}; "
-        f"trust: {chunk['prov_trust']}\n{chunk['text']}"
+        f"trust: {chunk['prov_trust']}\n{text}"
     )
 
 
@@ -234,10 +273,20 @@ async def retrieve_node(state: ResearchState) -> ResearchState:
     t0 = time.perf_counter()
     query = state["current_query"]
 
-    chunks = await vector_search(query, n_results=5, file_ids=state.get("scope"))
-    state["retrieved_excerpts"] = [
-        _excerpt_block(i + 1, chunk) for i, chunk in enumerate(chunks)
-    ]
+    prefetch = state.get("prefetch")
+    if prefetch is not None:
+        state["prefetch"] = None
+        chunks = await prefetch
+    else:
+        chunks = await vector_search(query, n_results=5, file_ids=state.get("scope"))
+    excerpts = [_excerpt_block(i + 1, chunk) for i, chunk in enumerate(chunks)]
+    # A refined query that finds exactly what the last pass found gives
+    # analyze nothing new to read, so another analyze and review would be
+    # two model calls restating the notes already taken.
+    repeated = state["loop_count"] > 0 and excerpts == state["retrieved_excerpts"]
+    state["retrieved_excerpts"] = excerpts
+    if repeated:
+        state["is_complete"] = True
     # Taint accumulates across loops: a later clean retrieval does not
     # untaint a turn that has already read untrusted bytes.
     state["tainted"] = state.get("tainted", False) or any(
@@ -254,7 +303,8 @@ async def retrieve_node(state: ResearchState) -> ResearchState:
     else:
         _emit_event(state, "searching", "No relevant documents found", meta=meta)
 
-    logger.info("[LATENCY] retrieve_node: %.3fs (%d chunks)", elapsed, len(chunks))
+    logger.info("[LATENCY] retrieve_node: %.3fs (%d chunks%s)", elapsed, len(chunks),
+                ", unchanged: finishing" if repeated else "")
     return state
 
 
@@ -267,7 +317,7 @@ async def analyze_node(state: ResearchState) -> ResearchState:
     t0 = time.perf_counter()
 
     chunks_text = "\n\n---\n\n".join(state["retrieved_excerpts"])
-    current_notes = "\n".join(f"- {n}" for n in state["research_notes"]) if state["research_notes"] else "None yet."
+    current_notes = _bulleted(state["research_notes"]) if state["research_notes"] else "None yet."
 
     prompt = Prompt.render(ANALYZE_PROMPT, {
         "current_query": state["current_query"],
@@ -283,14 +333,7 @@ async def analyze_node(state: ResearchState) -> ResearchState:
     analysis = result.text
 
     if "NO_RELEVANT_INFO" not in analysis:
-        # Extract bullet points as individual notes
-        lines = analysis.strip().split("\n")
-        new_notes = [
-            line.lstrip("- \u2022*").strip()
-            for line in lines
-            if line.strip() and len(line.strip()) > 10
-        ]
-        new_notes = _merge_notes(state["research_notes"], new_notes)
+        new_notes = _merge_notes(state["research_notes"], _extract_notes(analysis))
         if new_notes:
             state["research_notes"].extend(new_notes)
             _emit_event(state, "note_taking", f"Extracted {len(new_notes)} findings",
@@ -309,18 +352,21 @@ async def save_notes_node(state: ResearchState) -> ResearchState:
 
     header = f"\n\n## Research: {state['current_query']}\n"
     header += f"*{datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n"
-    notes_content = "\n".join(f"- {note}" for note in state["research_notes"])
+    notes_content = _bulleted(state["research_notes"])
     payload = header + notes_content + "\n"
 
-    # Use run_in_executor to avoid blocking the event loop on file I/O
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(None, _write_notes, notes_path, payload)
+    # A few bullet lines land in the page cache faster than a thread hop
+    # takes, so only an unusually long batch goes to the notes I/O pool.
+    if len(payload) <= _INLINE_NOTES_WRITE_CHARS:
+        _write_notes(notes_path, payload)
+    else:
+        await run_note_io(_write_notes, notes_path, payload)
 
     return state
 
 
 def _write_notes(path: Path, content: str) -> None:
-    """Synchronous helper for writing notes (runs in executor)."""
+    """Append research notes; runs inline or on the notes I/O pool."""
     with open(path, "a") as f:
         f.write(content)
 
@@ -347,10 +393,10 @@ async def review_node(state: ResearchState) -> ResearchState:
         logger.info("[LATENCY] review_node: skipped (no research notes)")
         return state
 
-    notes_text = "\n".join(f"- {n}" for n in state["research_notes"])
+    notes_text = _bulleted(state["research_notes"])
 
     prompt = Prompt.render(REVIEW_PROMPT, {
-        "original_question": state["messages"][-1]["content"] if state["messages"] else state["current_query"],
+        "original_question": state["messages"][-1][1] if state["messages"] else state["current_query"],
         "notes_text": notes_text,
     })
 
@@ -377,6 +423,31 @@ async def review_node(state: ResearchState) -> ResearchState:
     return state
 
 
+# A backslash that _fix_json_escapes doubles: the complement of the three
+# cases it leaves alone, namely \" \\ \/ \u, \b or \f not followed by a
+# letter, and \n \r or \t not followed by a lowercase letter.
+_LATEX_ESCAPE_RE = re.compile(r'\\(?!["\\/u]|[bf](?![a-zA-Z])|[nrt](?![a-z]))')
+
+# Markdown code fence around a JSON payload.
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*\n(.*?)\n```", re.DOTALL)
+
+# The only two characters the JSON string walkers below act on. Everything
+# between two matches is copied as one slice instead of char by char.
+_QUOTE_OR_BACKSLASH_RE = re.compile(r'["\\]')
+
+# JSON escapes that are left as they are inside a string value.
+_JSON_ESCAPE_CHARS = frozenset('"\\/bfnrtu')
+
+# Decoded value of each escape _walk_json_string always honours.
+_SIMPLE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'n': '\n', 'r': '\r', 't': '\t'}
+
+# '"<key>": "' for each field _regex_extract_fields recovers, in order.
+_FIELD_RES = {
+    key: re.compile(rf'"{key}"\s*:\s*"')
+    for key in ("action", "message", "filename", "content")
+}
+
+
 def _fix_json_escapes(text: str) -> str:
     r"""Double-escape backslashes that look like LaTeX, not JSON escapes.
 
@@ -391,63 +462,67 @@ def _fix_json_escapes(text: str) -> str:
     3. \n \r \t ARE common (newline, tab) — only escape when followed by a
        lowercase letter, since LaTeX commands are always lowercase (\nabla,
        \text, \rho) while genuine newlines precede uppercase or non-alpha.
+
+    All three rules only ever double the backslash itself, so they run as
+    one pass of _LATEX_ESCAPE_RE.
     """
-    # Step 1: clearly invalid JSON escapes (\p \a \l \e \s \d …)
-    text = re.sub(r'\\(?!["\\/bfnrtu])', r'\\\\', text)
-    # Step 2: \b \f + any letter → almost certainly LaTeX (\beta \frac)
-    text = re.sub(r'\\([bf])(?=[a-zA-Z])', r'\\\\\1', text)
-    # Step 3: \n \r \t + lowercase letter → likely LaTeX (\nabla \rho \text)
-    text = re.sub(r'\\([nrt])(?=[a-z])', r'\\\\\1', text)
-    return text
+    return _LATEX_ESCAPE_RE.sub(r'\\\\', text)
 
 
 def _escape_all_backslashes_in_strings(text: str) -> str:
     r"""Nuclear fallback: double every lone backslash inside JSON string values.
 
-    Walks the text character-by-character, tracking whether we're inside a
-    quoted string. Inside strings, any `\` not already followed by another `\`
-    gets doubled.
+    Walks the text tracking whether we're inside a quoted string, jumping
+    from one quote or backslash to the next. Inside strings, any `\` not
+    starting a valid JSON escape gets doubled.
     """
     out: list[str] = []
     in_string = False
     i = 0
-    while i < len(text):
-        ch = text[i]
-        if ch == '"' and (i == 0 or text[i - 1] != '\\'):
-            in_string = not in_string
-            out.append(ch)
-            i += 1
-        elif in_string and ch == '\\':
-            # Check if already a valid JSON escape
-            if i + 1 < len(text) and text[i + 1] in ('"', '\\', '/', 'b', 'f', 'n', 'r', 't', 'u'):
-                out.append(ch)         # keep the backslash
-                out.append(text[i + 1])  # keep the escape char
-                i += 2
-            else:
-                out.append('\\\\')  # double it
-                i += 1
+    n = len(text)
+    while (m := _QUOTE_OR_BACKSLASH_RE.search(text, i)) is not None:
+        j = m.start()
+        out.append(text[i:j])
+        if text[j] == '"':
+            # The raw previous character, even when it closed a \\ pair
+            if j == 0 or text[j - 1] != '\\':
+                in_string = not in_string
+            out.append('"')
+            i = j + 1
+        elif in_string and j + 1 < n and text[j + 1] in _JSON_ESCAPE_CHARS:
+            out.append(text[j:j + 2])  # already a valid JSON escape
+            i = j + 2
         else:
-            out.append(ch)
-            i += 1
+            out.append('\\\\' if in_string else '\\')
+            i = j + 1
+    out.append(text[i:])
     return "".join(out)
 
 
 def _try_parse_json(text: str) -> dict | None:
-    """Try json.loads with progressively aggressive escape fixing."""
+    """Try orjson.loads with progressively aggressive escape fixing.
+
+    Both fixes only ever rewrite backslashes, so text without one, or a fix
+    that leaves the text as it was, would just fail the same parse again.
+    """
     # 1. Raw attempt
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
+    if "\\" not in text:
+        return None
     # 2. Regex-based fix (handles most LaTeX)
-    try:
-        return json.loads(_fix_json_escapes(text))
-    except json.JSONDecodeError:
-        pass
+    fixed = _fix_json_escapes(text)
+    if fixed != text:
+        try:
+            return orjson.loads(fixed)
+        except orjson.JSONDecodeError:
+            pass
     # 3. Nuclear: escape every lone backslash inside string values
     try:
-        return json.loads(_escape_all_backslashes_in_strings(text))
-    except json.JSONDecodeError:
+        return orjson.loads(_escape_all_backslashes_in_strings(text))
+    except orjson.JSONDecodeError:
         return None
 
 
@@ -458,30 +533,34 @@ def _walk_json_string(text: str, start: int) -> tuple[str, int]:
     as LaTeX (\\beta, \\frac) rather than backspace/form-feed.
     """
     i = start
+    n = len(text)
     chars: list[str] = []
-    while i < len(text):
-        ch = text[i]
-        if ch == '\\' and i + 1 < len(text):
-            nxt = text[i + 1]
-            if nxt == '"':   chars.append('"');  i += 2
-            elif nxt == '\\': chars.append('\\'); i += 2
-            elif nxt == '/':  chars.append('/');  i += 2
-            elif nxt == 'n':  chars.append('\n'); i += 2
-            elif nxt == 'r':  chars.append('\r'); i += 2
-            elif nxt == 't':  chars.append('\t'); i += 2
-            elif nxt in ('b', 'f') and i + 2 < len(text) and text[i + 2].isalpha():
-                # LaTeX (\beta, \frac) — keep the backslash + letter
-                chars.append('\\'); chars.append(nxt); i += 2
-            elif nxt == 'b':  chars.append('\b'); i += 2
-            elif nxt == 'f':  chars.append('\f'); i += 2
-            else:
-                # Unknown escape — keep as-is (LaTeX like \eta, \alpha …)
-                chars.append('\\'); chars.append(nxt); i += 2
-        elif ch == '"':
-            return ''.join(chars), i + 1
+    while (m := _QUOTE_OR_BACKSLASH_RE.search(text, i)) is not None:
+        j = m.start()
+        chars.append(text[i:j])
+        if text[j] == '"':
+            return ''.join(chars), j + 1
+        if j + 1 == n:
+            # A trailing lone backslash is kept as text
+            chars.append('\\')
+            i = n
+            break
+        nxt = text[j + 1]
+        if nxt in _SIMPLE_ESCAPES:
+            chars.append(_SIMPLE_ESCAPES[nxt])
+        elif nxt in ('b', 'f') and j + 2 < n and text[j + 2].isalpha():
+            # LaTeX (\beta, \frac) — keep the backslash + letter
+            chars.append('\\' + nxt)
+        elif nxt == 'b':
+            chars.append('\b')
+        elif nxt == 'f':
+            chars.append('\f')
         else:
-            chars.append(ch); i += 1
-    return ''.join(chars), i
+            # Unknown escape — keep as-is (LaTeX like \eta, \alpha …)
+            chars.append('\\' + nxt)
+        i = j + 2
+    chars.append(text[i:])
+    return ''.join(chars), max(i, n)
 
 
 def _regex_extract_fields(text: str) -> dict | None:
@@ -497,8 +576,7 @@ def _regex_extract_fields(text: str) -> dict | None:
     text = text[start:end + 1]
 
     fields: dict[str, str] = {}
-    for key in ("action", "message", "filename", "content"):
-        pattern = re.compile(rf'"{key}"\s*:\s*"')
+    for key, pattern in _FIELD_RES.items():
         match = pattern.search(text)
         if not match:
             continue
@@ -519,13 +597,17 @@ def _extract_json(text: str) -> tuple[dict | None, str]:
     """
     text = text.strip()
 
-    # Direct parse
-    result = _try_parse_json(text)
-    if result is not None:
-        return result, "direct"
+    # Direct parse. Only an object can be the payload, and JSON allows no
+    # trailing text, so anything else cannot parse as one and goes
+    # straight to the searches below.
+    whole = text.startswith("{") and text.endswith("}")
+    if whole:
+        result = _try_parse_json(text)
+        if result is not None:
+            return result, "direct"
 
     # Strip markdown code fences
-    m = re.search(r"```(?:json)?\s*\n(.*?)\n```", text, re.DOTALL)
+    m = _JSON_FENCE_RE.search(text)
     if m:
         result = _try_parse_json(m.group(1).strip())
         if result is not None:
@@ -534,7 +616,9 @@ def _extract_json(text: str) -> tuple[dict | None, str]:
     # Find outermost { ... }
     start = text.find("{")
     end = text.rfind("}")
-    if start != -1 and end > start:
+    # When the text is already brace-to-brace this span is the whole text,
+    # which the direct parse just failed on.
+    if start != -1 and end > start and not whole:
         result = _try_parse_json(text[start : end + 1])
         if result is not None:
             return result, "braces"
@@ -551,8 +635,8 @@ async def final_response_node(state: ResearchState) -> ResearchState:
     """Synthesize a final answer from all research notes + conversation context."""
     t0 = time.perf_counter()
 
-    notes_text = "\n".join(f"- {n}" for n in state["research_notes"]) if state["research_notes"] else "No specific research findings."
-    history = "\n".join(f"{m['role']}: {m['content']}" for m in state["messages"][-6:])
+    notes_text = _bulleted(state["research_notes"]) if state["research_notes"] else "No specific research findings."
+    history = "\n".join(f"{role}: {text}" for role, text in state["messages"][-6:])
     active_notes = state["current_note"][:2000] if state["current_note"] else "No active notes."
 
     active_title = state["active_note_title"] or "Untitled"
@@ -625,8 +709,8 @@ async def final_response_node(state: ResearchState) -> ResearchState:
         try:
             if action == "create":
                 title = filename.replace(".md", "") if filename else "Untitled"
-                result = create_note_file(title)
-                append_to_note(result["id"], content)
+                result = await run_note_io(create_note_file, title)
+                await run_note_io(append_to_note, result["id"], content)
                 logger.info("Created note %s and wrote %d chars", result["id"], len(content))
                 _emit_event(state, "action", {
                     "action": "create_new",
@@ -639,7 +723,7 @@ async def final_response_node(state: ResearchState) -> ResearchState:
             elif action == "edit":
                 note_id = state.get("active_note_id")
                 if note_id:
-                    result = append_to_note(note_id, content)
+                    result = await run_note_io(append_to_note, note_id, content)
                     logger.info("Appended %d chars to note %s", len(content), note_id)
                     _emit_event(state, "action", {
                         "action": "edit_current",
@@ -730,12 +814,25 @@ async def _stream_fast_fact(
     })
 
     t_pipeline = time.perf_counter()
-    result = await complete(Purpose.FAST_FACT, prompt, state["budget"])
+    # Streamed: a fast_fact answer is plain prose, so each delta can be
+    # shown as it arrives instead of after the whole generation.
+    result = None
+    think = ThinkTagFilter()
+    async for item in stream_complete(Purpose.FAST_FACT, prompt, state["budget"]):
+        if isinstance(item, ModelResult):
+            result = item
+        elif visible := think.feed(item):
+            yield {"type": "text_delta", "content": visible}
+    if tail := think.flush():
+        yield {"type": "text_delta", "content": tail}
     _account(state, result)
 
+    # The closing event carries the turn's stats, which only exist once the
+    # call has finished, and says the text itself has already been sent.
     yield {
         "type": "text",
         "content": result.text or "I couldn't generate a response.",
+        "streamed": True,
         "meta": _turn_meta(
             state,
             time.perf_counter() - t_pipeline,
@@ -749,6 +846,13 @@ async def _stream_fast_fact(
 # -- Graph ------------------------------------------------------------------
 
 
+def _after_retrieve(state: ResearchState) -> str:
+    """Route after retrieve: analyze, unless the retrieval repeated the last one."""
+    if state["is_complete"]:
+        return "final_response"
+    return "analyze"
+
+
 def _should_continue(state: ResearchState) -> str:
     """Route after review: loop back to retrieve or proceed to final response."""
     if state["is_complete"]:
@@ -769,7 +873,10 @@ def build_research_graph() -> StateGraph:
 
     # Define edges
     graph.set_entry_point("retrieve")
-    graph.add_edge("retrieve", "analyze")
+    graph.add_conditional_edges("retrieve", _after_retrieve, {
+        "analyze": "analyze",
+        "final_response": "final_response",
+    })
     graph.add_edge("analyze", "save_notes")
     graph.add_edge("save_notes", "review")
     graph.add_conditional_edges("review", _should_continue, {
@@ -787,8 +894,15 @@ research_agent = build_research_graph()
 
 
 
+def _latest_user_query(messages: list[tuple[str, str]]) -> str:
+    for role, text in reversed(messages):
+        if role == "user":
+            return text
+    return ""
+
+
 async def _prepare_turn(
-    messages: list[dict[str, str]],
+    messages: list[tuple[str, str]],
     current_note: str,
 ) -> tuple[str, str, str, int, Budget, ModelResult | None]:
     """Resolve the user query, history window, route, and per-turn budget.
@@ -797,13 +911,8 @@ async def _prepare_turn(
     turn_id as the rest of the turn, and returns its ModelResult so the
     caller can fold it into the turn's totals.
     """
-    user_query = ""
-    for msg in reversed(messages):
-        if msg["role"] == "user":
-            user_query = msg["content"]
-            break
-
-    history = "\n".join(f"{m['role']}: {m['content']}" for m in messages[-3:])
+    user_query = _latest_user_query(messages)
+    history = "\n".join(f"{role}: {text}" for role, text in messages[-3:])
 
     budget = Budget.interactive()
     route, classify_result = await classify_query(user_query, history, current_note, budget)
@@ -814,7 +923,7 @@ async def _prepare_turn(
 
 
 def _initial_state(
-    messages: list[dict[str, str]],
+    messages: list[tuple[str, str]],
     current_note: str,
     user_query: str,
     route: str,
@@ -824,6 +933,7 @@ def _initial_state(
     active_note_title: str,
     active_note_id: str | None,
     scope: list[str] | None,
+    prefetch: asyncio.Task | None = None,
 ) -> ResearchState:
     return {
         "messages": messages,
@@ -840,6 +950,7 @@ def _initial_state(
         "active_note_title": active_note_title,
         "active_note_id": active_note_id,
         "scope": scope,
+        "prefetch": prefetch,
         "route": route,
         "max_loops": max_loops,
         "budget": budget,
@@ -855,7 +966,7 @@ def _initial_state(
 
 
 async def stream_research_agent(
-    messages: list[dict[str, str]],
+    messages: list[tuple[str, str]],
     current_note: str = "",
     allow_edits: bool = False,
     active_note_title: str = "",
@@ -868,72 +979,91 @@ async def stream_research_agent(
     Yields dicts with:
         {"type": "searching"|"reasoning"|"note_taking"|"text"|"action", "content": ...}
     """
-    user_query, history, route, max_loops, budget, classify_result = await _prepare_turn(
-        messages, current_note
-    )
-
-    state = _initial_state(
-        messages, current_note, user_query, route, max_loops, budget,
-        allow_edits, active_note_title, active_note_id, scope,
+    # Every retrieving route opens by searching the user's own words with
+    # the turn's scope, and both are known before the classifier answers.
+    # Starting that search now overlaps its embed and vector query with
+    # the classifier's round trip; a fast_fact turn drops it unread.
+    prefetch = asyncio.create_task(
+        vector_search(_latest_user_query(messages), n_results=5, file_ids=scope)
     )
-    # The classifier runs before the graph, so its usage has to be seeded
-    # onto the state the graph starts from. Folding it through the same
-    # _account the nodes use is what keeps total_cost_usd and total_calls
-    # describing the same set of calls.
-    if classify_result is not None:
-        _account(state, classify_result)
-
-    # Fast-fact: skip the graph entirely
-    if route == "fast_fact":
-        async for event in _stream_fast_fact(user_query, history, current_note, state):
-            yield event
-        return
-
-    last_event_count = 0
-    total_cost = 0.0
-    t_pipeline = time.perf_counter()
-    logger.info("[ROUTE] %s → max_loops=%d, max_calls=%d", route, max_loops, budget.max_calls)
-
-    # max_loops is enforced in exactly one place, review_node. If that node
-    # ever raises or is bypassed, the graph would loop to LangGraph's
-    # default recursion_limit of 25 instead — roughly eight unbudgeted
-    # analyze passes. Each loop is four nodes (retrieve, analyze,
-    # save_notes, review) plus one final_response superstep, so this is the
-    # route's own shape with one superstep of headroom.
-    config = {"recursion_limit": 4 * max_loops + 2}
-
-    async for state_update in research_agent.astream(state, config=config):
-        # Each state_update is a dict of {node_name: updated_state}
-        for node_name, node_state in state_update.items():
-            if node_name == "__end__":
-                continue
-
-            t_node_done = time.perf_counter()
-            logger.info("[LATENCY] node '%s' completed at +%.3fs", node_name, t_node_done - t_pipeline)
-
-            # LangGraph hands each node a copy of the state dict, so a
-            # scalar written by a node is only visible on what it yields.
-            total_cost = node_state.get("total_cost_usd", total_cost)
-
-            events = node_state.get("events", [])
-            # Yield any new events since last check
-            for event in events[last_event_count:]:
+    try:
+        user_query, history, route, max_loops, budget, classify_result = await _prepare_turn(
+            messages, current_note
+        )
+        if route == "fast_fact":
+            prefetch.cancel()
+
+        state = _initial_state(
+            messages, current_note, user_query, route, max_loops, budget,
+            allow_edits, active_note_title, active_note_id, scope,
+            None if route == "fast_fact" else prefetch,
+        )
+        # The classifier runs before the graph, so its usage has to be seeded
+        # onto the state the graph starts from. Folding it through the same
+        # _account the nodes use is what keeps total_cost_usd and total_calls
+        # describing the same set of calls.
+        if classify_result is not None:
+            _account(state, classify_result)
+
+        # Fast-fact: skip the graph entirely
+        if route == "fast_fact":
+            async for event in _stream_fast_fact(user_query, history, current_note, state):
                 yield event
-            last_event_count = len(events)
-
-            # If we have a final answer, yield it as text with stats
-            if node_state.get("final_answer"):
-                yield {
-                    "type": "text",
-                    "content": node_state["final_answer"],
-                    "meta": _turn_meta(
-                        node_state,
-                        time.perf_counter() - t_pipeline,
-                        latency_s=node_state.get("final_latency_s", 0.0),
-                        input_tokens=node_state.get("final_input_tokens", 0),
-                        output_tokens=node_state.get("final_output_tokens", 0),
-                    ),
-                }
-
-    logger.info("[LATENCY] === pipeline total: %.3fs, %d calls, $%.6f ===",
-                time.perf_counter() - t_pipeline, budget.calls_made, total_cost)
+            return
+
+        last_event_count = 0
+        total_cost = 0.0
+        t_pipeline = time.perf_counter()
+        logger.info("[ROUTE] %s → max_loops=%d, max_calls=%d", route, max_loops, budget.max_calls)
+
+        # max_loops is enforced in exactly one place, review_node. If that node
+        # ever raises or is bypassed, the graph would loop to LangGraph's
+        # default recursion_limit of 25 instead — roughly eight unbudgeted
+        # analyze passes. Each loop is four nodes (retrieve, analyze,
+        # save_notes, review) plus one final_response superstep, so this is the
+        # route's own shape with one superstep of headroom.
+        config = {"recursion_limit": 4 * max_loops + 2}
+
+        async for state_update in research_agent.astream(state, config=config):
+            # Each state_update is a dict of {node_name: updated_state}
+            for node_name, node_state in state_update.items():
+                if node_name == "__end__":
+                    continue
+
+                t_node_done = time.perf_counter()
+                logger.info("[LATENCY] node '%s' completed at +%.3fs", node_name, t_node_done - t_pipeline)
+
+                # LangGraph hands each node a copy of the state dict, so a
+                # scalar written by a node is only visible on what it yields.
+                total_cost = node_state.get("total_cost_usd", total_cost)
+
+                events = node_state.get("events", [])
+                # Yield any new events since last check
+                for event in events[last_event_count:]:
+                    yield event
+                last_event_count = len(events)
+
+                # If we have a final answer, yield it as text with stats
+                if node_state.get("final_answer"):
+                    yield {
+                        "type": "text",
+                        "content": node_state["final_answer"],
+                        "meta": _turn_meta(
+                            node_state,
+                            time.perf_counter() - t_pipeline,
+                            latency_s=node_state.get("final_latency_s", 0.0),
+                            input_tokens=node_state.get("final_input_tokens", 0),
+                            output_tokens=node_state.get("final_output_tokens", 0),
+                        ),
+                    }
+
+        logger.info("[LATENCY] === pipeline total: %.3fs, %d calls, $%.6f ===",
+                    time.perf_counter() - t_pipeline, budget.calls_made, total_cost)
+    finally:
+        # retrieve_node is what awaits it. A turn that ends before that, on
+        # an error, a fast_fact route or a client that went away, would
+        # leave it running and its exception never retrieved.
+        if not prefetch.done():
+            prefetch.cancel()
+        elif not prefetch.cancelled():
+            prefetch.exception()
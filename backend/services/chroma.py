@@ -5,15 +5,20 @@ in ChromaDB — there is no separate registry file.
 """
 
 import hashlib
-import json
 import logging
+import mmap
+import os
 import threading
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
 
 import chromadb
+import orjson
 from chromadb.config import Settings
 
-from config import CHROMA_DIR, CHROMA_COLLECTION, SAVED_TAGS_FILE
-from services.embeddings import get_embedding_function
+from config import CHROMA_DIR, CHROMA_COLLECTION, EMBEDDING_MODEL, SAVED_TAGS_FILE
+from services.embeddings import EMBEDDING_MODELS, get_embedding_function
 from services.migrate import repair_embedding_function
 
 logger = logging.getLogger(__name__)
@@ -57,14 +62,46 @@ def _repair_once() -> None:
             logger.error(f"Embedding-function repair failed: {exc}", exc_info=True)
 
 
+_collection: chromadb.Collection | None = None
+_collection_lock = threading.Lock()
+
+
 def get_collection() -> chromadb.Collection:
-    """Get or create the ChromaDB collection with cosine similarity."""
-    _repair_once()
-    return _client.get_or_create_collection(
-        name=CHROMA_COLLECTION,
-        metadata={"hnsw:space": "cosine"},
-        embedding_function=_ef,
-    )
+    """Get or create the ChromaDB collection with cosine similarity.
+
+    The handle is created once and shared. get_or_create_collection goes
+    to sqlite and re-validates the embedding function every time, and the
+    document helpers below call this several times per upload. Nothing in
+    the app drops or recreates the collection, so the handle never goes
+    stale.
+    """
+    global _collection
+    if _collection is None:
+        with _collection_lock:
+            if _collection is None:
+                _repair_once()
+                _collection = _client.get_or_create_collection(
+                    name=CHROMA_COLLECTION,
+                    metadata={"hnsw:space": "cosine"},
+                    embedding_function=_ef,
+                )
+    return _collection
+
+
+def warm_index() -> None:
+    """Load the vector index into memory before the first search needs it.
+
+    Chroma reads a collection's HNSW segment from disk on its first query,
+    so without this the user's first question pays that load inside
+    retrieval. Any vector will do; a unit vector of the configured size
+    keeps the model out of it, so this works before the embedder loads.
+    """
+    col = get_collection()
+    if col.count() == 0:
+        return
+    probe = [0.0] * EMBEDDING_MODELS[EMBEDDING_MODEL]["dimensions"]
+    probe[0] = 1.0
+    col.query(query_embeddings=[probe], n_results=1, include=[])
 
 
 def max_batch_size() -> int:
@@ -75,9 +112,30 @@ def max_batch_size() -> int:
 # -- Document-level helpers (query across chunks) --------------------------
 
 
+def content_hasher():
+    """A fresh hasher for content_hash, for callers that hash incrementally."""
+    return hashlib.sha256()
+
+
 def hash_bytes(data: bytes) -> str:
     """Return a SHA-256 hex digest for raw file bytes."""
-    return hashlib.sha256(data).hexdigest()
+    hasher = content_hasher()
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def hash_file(path: str | Path) -> str:
+    """hash_bytes for a file on disk, hashed from a read-only mapping.
+
+    The hasher reads the mapped pages directly, so a large PDF is never
+    copied into a bytes object first.
+    """
+    hasher = content_hasher()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+    return hasher.hexdigest()
 
 
 def find_by_hash(content_hash: str) -> dict | None:
@@ -85,14 +143,18 @@ def find_by_hash(content_hash: str) -> dict | None:
 
     Returns {"file_id": str, "filename": str} or None.
     """
-    col = get_collection()
-    if col.count() == 0:
-        return None
-    results = col.get(where={"content_hash": content_hash}, include=["metadatas"], limit=1)
-    if results["ids"]:
+    meta = _heads_index().by_content_hash.get(content_hash)
+    if meta is None:
+        # Same fallback as get_document_meta: a truncated Item without a
+        # head must still be found, or the resume path would re-ingest it
+        # under a new id.
+        results = get_collection().get(
+            where={"content_hash": content_hash}, include=["metadatas"], limit=1
+        )
+        if not results["ids"]:
+            return None
         meta = results["metadatas"][0]
-        return {"file_id": meta["file_id"], "filename": meta["filename"]}
-    return None
+    return {"file_id": meta["file_id"], "filename": meta["filename"]}
 
 
 def item_completion(file_id: str) -> tuple[int, int]:
@@ -122,7 +184,7 @@ def _load_saved_tags() -> list[str]:
     if not SAVED_TAGS_FILE.exists():
         return []
     try:
-        return json.loads(SAVED_TAGS_FILE.read_text())
+        return orjson.loads(SAVED_TAGS_FILE.read_bytes())
     except Exception:
         return []
 
@@ -131,26 +193,36 @@ def save_tag(tag: str) -> None:
     """Persist a user-created tag so it appears in future uploads."""
     tags = set(_load_saved_tags())
     tags.add(tag)
-    SAVED_TAGS_FILE.write_text(json.dumps(sorted(tags)))
+    SAVED_TAGS_FILE.write_bytes(orjson.dumps(sorted(tags)))
 
 
 def list_all_tags() -> list[str]:
-    """Collect all unique tags across all chunks + saved tags, sorted."""
-    col = get_collection()
+    """Collect all unique tags across all documents + saved tags, sorted.
+
+    Tags are denormalised onto every segment, so the cached heads answer
+    for each document that has one. set_tags drops that cache, so a retag
+    shows up on the next call. An Item whose ingest died before its
+    ordinal-0 segment has no head but is still listed by the library and
+    /pdfs, so its tags come from one query for the records outside the
+    heads, which on a healthy store returns nothing.
+    """
     tags: set[str] = set(_load_saved_tags())
-    if col.count() > 0:
-        results = col.get(include=["metadatas"])
-        for meta in results["metadatas"] or []:
-            tags.update(meta.get("tags", []))
+    heads = _heads_index().by_file_id
+    for meta in heads.values():
+        tags.update(meta.get("tags") or [])
+    # $nin rejects an empty list; with no heads every record is headless
+    where = {"file_id": {"$nin": list(heads)}} if heads else None
+    for meta in get_collection().get(where=where, include=["metadatas"])["metadatas"] or []:
+        tags.update(meta.get("tags") or [])
     return sorted(tags)
 
 
 def indexed_file_ids() -> set[str]:
     """Every file_id present in the collection.
 
-    A full metadata scan, the same shape as list_all_tags. Reading ids and
-    splitting on the ordinal suffix would be cheaper but would misparse any
-    file_id that itself ends in "-<digits>".
+    A full metadata scan. Reading ids and splitting on the ordinal suffix
+    would be cheaper but would misparse any file_id that itself ends in
+    "-<digits>".
     """
     col = get_collection()
     if col.count() == 0:
@@ -159,63 +231,189 @@ def indexed_file_ids() -> set[str]:
     return {meta.get("file_id", "") for meta in results["metadatas"] or []} - {""}
 
 
-def get_document_meta(file_id: str) -> dict | None:
-    """Look up metadata for a document by file_id (reads first chunk)."""
+# Rows per page for full-store metadata scans. Big enough that a typical
+# library is a handful of round trips, small enough that a scan never
+# holds more than one page of per-chunk metadata at a time.
+_SCAN_PAGE_SIZE = 1000
+
+
+def iter_metadatas(where: dict | None = None):
+    """Yield every matching record's metadata, one page at a time."""
     col = get_collection()
-    if col.count() == 0:
-        return None
-    results = col.get(where={"file_id": file_id}, include=["metadatas"], limit=1)
+    offset = 0
+    while True:
+        page = col.get(where=where, include=["metadatas"], limit=_SCAN_PAGE_SIZE, offset=offset)
+        metadatas = page["metadatas"] or []
+        yield from metadatas
+        if len(metadatas) < _SCAN_PAGE_SIZE:
+            return
+        offset += _SCAN_PAGE_SIZE
+
+
+def list_document_metas() -> list[dict]:
+    """One summary per document, in first-stored order.
+
+    Item-level fields are denormalised onto every segment, so the first
+    segment seen carries them all and the rest only add to the count.
+    Paged, so peak memory is one page of chunk metadata plus one entry
+    per document rather than the whole store's metadata at once. An
+    empty store is one short first page, so it needs no count() probe.
+    """
+    docs: dict[str, dict] = {}
+    counts: Counter[str] = Counter()
+    for meta in iter_metadatas():
+        fid = meta.get("file_id", "")
+        counts[fid] += 1
+        if fid not in docs:
+            docs[fid] = {
+                "file_id": fid,
+                "filename": meta.get("filename", "unknown"),
+                "title": meta.get("title", meta.get("filename", "unknown")),
+                # The list is no longer PDFs only, and the renderer has to
+                # tell sources apart to know which ones the reader opens.
+                "source_type": meta.get("source_type", "pdf"),
+                "chunk_count": 0,
+                "tags": meta.get("tags", []),
+                "publish_date": meta.get("publish_date") or None,
+                # What chunk_count will reach once ingest finishes; None
+                # for records written before segment_total existed.
+                "segment_total": meta.get("segment_total") if isinstance(meta.get("segment_total"), int) else None,
+            }
+    for fid, doc in docs.items():
+        doc["chunk_count"] = counts[fid]
+    return list(docs.values())
+
+
+def document_heads(where: dict | None = None) -> list[dict]:
+    """Metadata of each matching document's first segment: one row per document.
+
+    Item-level fields are denormalised onto every segment, so the
+    ordinal-0 segment answers for the whole document and a listing never
+    has to pull every chunk's metadata to dedupe it. A document whose
+    ordinal 0 was never stored has no row here.
+    """
+    clause = {"chunk_index": 0} if where is None else {"$and": [{"chunk_index": 0}, where]}
+    return get_collection().get(where=clause, include=["metadatas"])["metadatas"] or []
+
+
+class _Heads(NamedTuple):
+    """One snapshot of head-segment metadata, under each key it is looked up by."""
+
+    by_filename: dict[str, dict]
+    by_file_id: dict[str, dict]
+    by_content_hash: dict[str, dict]
+
+
+# Head-segment metadata of every document, kept in memory so a listing of
+# pdfs/, a duplicate check or a metadata lookup costs no store query at
+# all once warm. Anything that writes an ordinal-0 segment, or updates or
+# deletes a document's records, drops it through invalidate_heads(); the
+# next reader rebuilds it with one heads query.
+_heads_lock = threading.Lock()
+_heads: _Heads | None = None
+_heads_generation = 0
+
+
+def invalidate_heads() -> None:
+    """Forget the cached heads after a write that may have changed one."""
+    global _heads, _heads_generation
+    with _heads_lock:
+        _heads = None
+        _heads_generation += 1
+
+
+def _heads_index() -> _Heads:
+    global _heads
+    with _heads_lock:
+        if _heads is not None:
+            return _heads
+        generation = _heads_generation
+    heads = _Heads({}, {}, {})
+    for meta in document_heads():
+        for index, key in zip(heads, ("filename", "file_id", "content_hash")):
+            if meta.get(key):
+                index.setdefault(meta[key], meta)
+    with _heads_lock:
+        # A write that landed mid-build may be missing from this snapshot;
+        # serve it this once but leave the cache empty for the next reader.
+        if generation == _heads_generation:
+            _heads = heads
+    return heads
+
+
+def heads_by_filename() -> dict[str, dict]:
+    """Head-segment metadata of every stored document, keyed by filename."""
+    return _heads_index().by_filename
+
+
+def get_document_meta(file_id: str) -> dict | None:
+    """Look up metadata for a document by file_id.
+
+    Answered from the heads index. A miss still asks the store, because
+    an Item whose ingest died before its ordinal-0 segment was written has
+    records but no head, and deleting it must still find its raw file.
+    """
+    meta = _heads_index().by_file_id.get(file_id)
+    if meta is not None:
+        return meta
+    results = get_collection().get(where={"file_id": file_id}, include=["metadatas"], limit=1)
     if results["ids"]:
         return results["metadatas"][0]
     return None
 
 
-def set_tags(file_id: str, tags: list[str]) -> bool:
-    """Update tags on all chunks belonging to a document.
+def update_document_meta(file_id: str, **fields) -> bool:
+    """Write item-level fields onto every chunk of a document at once.
 
-    Chroma rejects an empty list, so clearing the last tag writes None,
-    which removes the key. That is the same on-disk shape an untagged
-    upload produces, and every reader already defaults it to [].
+    One id lookup and one update however many fields change, so a rename
+    and a retag in the same edit cost one round trip, not two. The update
+    carries only the given keys; Chroma merges them into each chunk's
+    existing metadata, so nothing else needs reading first.
     """
     col = get_collection()
     chunk_ids = col.get(where={"file_id": file_id}, include=[])["ids"]
     if not chunk_ids:
         return False
-    col.update(ids=chunk_ids, metadatas=[{"tags": tags or None} for _ in chunk_ids])
+    if fields:
+        col.update(ids=chunk_ids, metadatas=[dict(fields) for _ in chunk_ids])
+        invalidate_heads()
     return True
 
 
+def set_tags(file_id: str, tags: list[str]) -> bool:
+    """Update tags on all chunks belonging to a document.
+
+    Chroma rejects an empty list, so clearing the last tag writes None,
+    which removes the key. That is the same on-disk shape an untagged
+    upload produces, and every reader already defaults it to [].
+    """
+    return update_document_meta(file_id, tags=tags or None)
+
+
 def set_title(file_id: str, title: str) -> bool:
     """Update title on all chunks belonging to a document."""
-    col = get_collection()
-    chunk_ids = col.get(where={"file_id": file_id}, include=[])["ids"]
-    if not chunk_ids:
-        return False
-    col.update(ids=chunk_ids, metadatas=[{"title": title} for _ in chunk_ids])
-    return True
+    return update_document_meta(file_id, title=title)
 
 
 def delete_chunks(file_id: str) -> int:
     """Delete all ChromaDB chunks for a file_id. Returns count deleted."""
     col = get_collection()
-    results = col.get(where={"file_id": file_id}, include=[])
-    chunk_ids = results["ids"]
+    chunk_ids = col.get(where={"file_id": file_id}, include=[])["ids"]
     if chunk_ids:
         col.delete(ids=chunk_ids)
+        invalidate_heads()
     return len(chunk_ids)
 
 
-def resolve_tag(tag: str) -> list[str]:
-    """Return all unique file_ids that have the given tag."""
+def resolve_tag_many(tags: list[str]) -> set[str]:
+    """Return every file_id carrying any of the given tags, in one query."""
+    unique = list(dict.fromkeys(t for t in tags if t))
+    if not unique:
+        return set()
     col = get_collection()
     if col.count() == 0:
-        return []
-    results = col.get(where={"tags": {"$contains": tag}}, include=["metadatas"])
-    seen: set[str] = set()
-    file_ids: list[str] = []
-    for meta in results["metadatas"] or []:
-        fid = meta.get("file_id", "")
-        if fid and fid not in seen:
-            seen.add(fid)
-            file_ids.append(fid)
-    return file_ids
+        return set()
+    clauses = [{"tags": {"$contains": tag}} for tag in unique]
+    where = clauses[0] if len(clauses) == 1 else {"$or": clauses}
+    results = col.get(where=where, include=["metadatas"])
+    return {meta.get("file_id", "") for meta in results["metadatas"] or []} - {""}
@@ -5,12 +5,24 @@ Backed by fastembed (quantized ONNX, no Torch dependency). To switch
 models, set EMBEDDING_MODEL in .env.local and re-ingest documents.
 """
 
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
 from chromadb import Documents, EmbeddingFunction, Embeddings
 
 from config import EMBEDDING_MODEL, MODELS_DIR
 
+logger = logging.getLogger(__name__)
+
 EMBEDDING_BACKEND = "fastembed"
 
+# fastembed resolves each model_name to its own ONNX export. The default
+# already runs int8: bge-small-en-v1.5 loads Qdrant/bge-small-en-v1.5-onnx-Q,
+# a dynamically quantized build (about 67 MB against 130 MB at fp32).
+# all-MiniLM-L6-v2 loads Qdrant/all-MiniLM-L6-v2-onnx, which is fp32.
 EMBEDDING_MODELS = {
     "bge-small-en-v1.5": {
         "model_name": "BAAI/bge-small-en-v1.5",
@@ -29,29 +41,168 @@ class FastembedEmbeddingFunction(EmbeddingFunction[Documents]):
     """Chroma embedding function backed by fastembed.
 
     The ONNX model is loaded lazily on first use so importing the backend
-    stays cheap and no model download happens at process startup.
+    stays cheap and no model download happens at process startup. warm()
+    loads it early, but only from files already on disk.
     """
 
     def __init__(self, model_name: str):
         self._model_name = model_name
         self._model = None
+        self._load_lock = threading.Lock()
+
+    def _load(self, **kwargs):
+        # Locked so a warm-up racing the first query loads one session, not two
+        with self._load_lock:
+            if self._model is None:
+                from fastembed import TextEmbedding
+
+                self._model = TextEmbedding(
+                    model_name=self._model_name,
+                    cache_dir=str(MODELS_DIR),
+                    **kwargs,
+                )
+            return self._model
+
+    def warm(self) -> bool:
+        """Load the model now if it is already downloaded. True if loaded."""
+        try:
+            self._load(local_files_only=True)
+        except Exception as exc:
+            logger.info(f"Embedding model not preloaded ({exc}); it loads on first use")
+            return False
+        return True
 
     def __call__(self, input: Documents) -> Embeddings:
-        if self._model is None:
-            from fastembed import TextEmbedding
-
-            self._model = TextEmbedding(
-                model_name=self._model_name,
-                cache_dir=str(MODELS_DIR),
-            )
-        return [vector.tolist() for vector in self._model.embed(list(input))]
+        model = self._model or self._load()
+        return [vector.tolist() for vector in model.embed(list(input))]
 
 
 def get_embedding_function(model_key: str | None = None) -> FastembedEmbeddingFunction:
-    """Return a fastembed-backed embedding function for the given model key."""
-    key = model_key or EMBEDDING_MODEL
-    cfg = EMBEDDING_MODELS[key]
-    return FastembedEmbeddingFunction(model_name=cfg["model_name"])
+    """Return the fastembed-backed embedding function for the given model key.
+
+    One instance per model for the whole process: the collection embeds
+    documents through it and the query path embeds searches through it,
+    so both share a single ONNX session instead of each loading its own.
+    """
+    return _embedding_function(model_key or EMBEDDING_MODEL)
+
+
+@lru_cache(maxsize=None)
+def _embedding_function(key: str) -> FastembedEmbeddingFunction:
+    return FastembedEmbeddingFunction(model_name=EMBEDDING_MODELS[key]["model_name"])
+
+
+def _query_embedding_function() -> FastembedEmbeddingFunction:
+    return get_embedding_function()
+
+
+def warm_query_embedder() -> bool:
+    """Preload the query model so the first search skips the ONNX load.
+
+    Loading the session takes seconds on a cold process, and without this
+    the user's first question pays for it inside retrieval.
+    """
+    return _query_embedding_function().warm()
+
+
+# Query text -> vector. The research loop searches the same strings again
+# across review rounds and follow-up turns, and each miss is a full ONNX
+# forward pass on the CPU. Keyed on the exact text: a near-duplicate query
+# is a different query, and reusing its vector would change what is
+# found. Vectors are tuples so no caller can mutate the cached copy. Only
+# touched from the event loop, so it needs no lock.
+_QUERY_CACHE_SIZE = 512
+_query_vectors: OrderedDict[str, tuple[float, ...]] = OrderedDict()
+
+
+def _remember(text: str, vector: tuple[float, ...]) -> None:
+    _query_vectors[text] = vector
+    _query_vectors.move_to_end(text)
+    if len(_query_vectors) > _QUERY_CACHE_SIZE:
+        _query_vectors.popitem(last=False)
+
+
+class QueryBatcher:
+    """Coalesce the query embeddings missed within a few milliseconds.
+
+    Concurrent turns, and the prefetch overlapping a turn's own search,
+    each need one vector. Embedding them one per thread hop runs the model
+    once per query; a batch shares one call, which costs little more than
+    a single query. The first miss opens a short window, and the batch
+    flushes when the window closes or it reaches max_batch. Identical
+    texts in one window share a single slot.
+
+    Bound to the event loop it was created on, since its futures are.
+    """
+
+    def __init__(self, max_batch: int = 32, window: float = 0.005):
+        self._max_batch = max_batch
+        self._window = window
+        self._pending: dict[str, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task] = set()
+
+    def submit(self, text: str) -> asyncio.Future:
+        """The future of *text*'s vector, queued for the next batch."""
+        future = self._pending.get(text)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[text] = loop.create_future()
+            if len(self._pending) >= self._max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self._window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._embed(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _embed(self, batch: dict[str, asyncio.Future]) -> None:
+        texts = list(batch)
+        try:
+            vectors = await asyncio.to_thread(_query_embedding_function(), texts)
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for text, vector in zip(texts, vectors):
+            vector = tuple(vector)
+            _remember(text, vector)
+            if not batch[text].done():
+                batch[text].set_result(vector)
+
+
+_batcher: QueryBatcher | None = None
+_batcher_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _query_batcher() -> QueryBatcher:
+    global _batcher, _batcher_loop
+    loop = asyncio.get_running_loop()
+    if _batcher_loop is not loop:
+        _batcher, _batcher_loop = QueryBatcher(), loop
+    return _batcher
+
+
+async def embed_query(text: str) -> tuple[float, ...]:
+    """Embed one search query with the configured model.
+
+    A repeat is answered from the cache; a miss joins the current batch.
+    Shielded so a cancelled search (a discarded prefetch) cannot cancel
+    the shared future under another caller waiting on the same text.
+    """
+    vector = _query_vectors.get(text)
+    if vector is not None:
+        _query_vectors.move_to_end(text)
+        return vector
+    return await asyncio.shield(_query_batcher().submit(text))
 
 
 def current_embedding_model_id(model_key: str | None = None) -> str:
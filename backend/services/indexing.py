@@ -12,10 +12,15 @@ import logging
 from dataclasses import dataclass, field
 from pathlib import Path
 
-from config import CONTEXTUALIZE_MIN_CHARS
-from services.chroma import get_collection
+from services.chroma import get_collection, invalidate_heads
 from services.embeddings import current_embedding_model_id
-from services.ingest import contextualize_chunk
+from services.ingest import (
+    SegmentWriter,
+    contextualize_chunk,
+    gather_or_cancel,
+    known_contexts,
+    worth_contextualizing,
+)
 from services.llm import Budget
 from services.schema import (
     ContentSource,
@@ -62,7 +67,7 @@ def _should_contextualize(draft: SegmentDraft, draft_count: int, whole_text: str
         draft_count > 1
         and bool(whole_text)
         and draft.modality in CONTEXTUALIZE_MODALITIES
-        and len(draft.content) >= CONTEXTUALIZE_MIN_CHARS
+        and worth_contextualizing(draft.content)
     )
 
 
@@ -77,6 +82,7 @@ def _drop_stale_segments(collection, item: Item, live_ids: set[str]) -> None:
     stale = sorted(existing - live_ids)
     if stale:
         collection.delete(ids=stale)
+        invalidate_heads()
         logger.info("Dropped %d stale segments for %s %s", len(stale), item.source_type, item.id)
 
 
@@ -111,15 +117,18 @@ async def index_item(
     item_tags = tags or []
     eligible = sum(1 for d in drafts if _should_contextualize(d, len(drafts), whole_text))
     budget = Budget.background("index", max_calls=eligible)
-    written = 0
     sem = asyncio.Semaphore(4)
+    contexts = await asyncio.to_thread(known_contexts, collection, item.source_id)
 
     async def _write(draft: SegmentDraft) -> None:
-        nonlocal written
         async with sem:
+            writer.check()
             content = draft.content
             context_status = "skipped"
-            if _should_contextualize(draft, len(drafts), whole_text):
+            if (context := contexts.get(draft.content)) is not None:
+                content = f"{context}\n\n{draft.content}"
+                context_status = "ok"
+            elif _should_contextualize(draft, len(drafts), whole_text):
                 try:
                     result = await contextualize_chunk(whole_text, draft.content, budget)
                     content = f"{result.text}\n\n{draft.content}"
@@ -139,25 +148,28 @@ async def index_item(
                 context_status=context_status,
                 span=draft.span,
             )
-            # Embedding runs inside collection.upsert and is CPU-bound, so
-            # calling it directly from this coroutine stalled every other
-            # request on the process for the length of the ingest.
-            await asyncio.to_thread(
-                collection.upsert,
-                ids=[segment_id(item.id, draft.ordinal)],
-                documents=[segment.content],
-                metadatas=[segment_metadata(item, segment, extra={
-                    "filename": filename,
-                    "original_chunk": draft.content,
-                    "tags": item_tags,
-                    "content_hash": item.source_id,
-                    "publish_date": item.created_at,
-                    "segment_total": len(drafts),
-                })],
-            )
-            written += 1
-
-    await asyncio.gather(*[_write(draft) for draft in drafts])
+            # Batched and written off the event loop by the writer, so
+            # this slot is free for the next contextualization at once.
+            writer.put(segment_id(item.id, draft.ordinal), segment.content, segment_metadata(item, segment, extra={
+                "filename": filename,
+                "original_chunk": draft.content,
+                "tags": item_tags,
+                "content_hash": item.source_id,
+                "publish_date": item.created_at,
+                "segment_total": len(drafts),
+            }))
+
+    # One contextualized request first, alone, so the document prefix is in
+    # the prompt cache before the rest fan out (see ingest_pdf).
+    first = next((
+        d for d in drafts
+        if d.content not in contexts and _should_contextualize(d, len(drafts), whole_text)
+    ), None)
+    async with SegmentWriter(collection, f"{item.source_type} {item.id}", len(drafts)) as writer:
+        if first is not None:
+            await _write(first)
+        await gather_or_cancel(*[_write(draft) for draft in drafts if draft is not first])
+    written = writer.written
     live_ids = {segment_id(item.id, draft.ordinal) for draft in drafts}
     await asyncio.to_thread(_drop_stale_segments, collection, item, live_ids)
     logger.info("Indexed %s %s: %d segments", item.source_type, item.id, written)
@@ -13,24 +13,45 @@ import bisect
 import logging
 import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 import pymupdf
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from prompts import CONTEXTUALIZER_PROMPT
-from services.chroma import get_collection
-from config import CHUNK_SIZE, CHUNK_OVERLAP, CONTEXT_DOC_CHARS
+from prompts import CONTEXTUALIZER_NEARBY_PROMPT, CONTEXTUALIZER_PROMPT
+from services.chroma import get_collection, invalidate_heads
+from config import (
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    CONTEXT_DOC_CHARS,
+    CONTEXTUALIZE_MIN_CHARS,
+    PDF_CONTEXTUALIZE_MIN_CHARS,
+)
 from services.embeddings import current_embedding_model_id
 from services.llm import Budget, ModelResult, Prompt, Purpose, complete
 from services.schema import Item, Segment, segment_id, segment_metadata
+from services.text_utils import SUBTITLE_SEPARATORS
 
 logger = logging.getLogger(__name__)
 
+# Most segments one upsert writes, and the longest a segment waits for
+# others to share its upsert.
+_UPSERT_BATCH = 32
+_UPSERT_WINDOW_S = 0.5
+
+# How much text around a chunk that starts past the document prefix is sent
+# with it: more before than after, since what a chunk continues is usually
+# what situates it.
+_NEARBY_BEFORE_CHARS = 4000
+_NEARBY_AFTER_CHARS = 2000
+
+_SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+
 text_splitter = RecursiveCharacterTextSplitter(
     chunk_size=CHUNK_SIZE,
     chunk_overlap=CHUNK_OVERLAP,
-    separators=["\n\n", "\n", ". ", " ", ""],
+    separators=_SEPARATORS,
     length_function=len,
 )
 
@@ -42,13 +63,21 @@ def extract_text_from_pdf(pdf_path: Path) -> tuple[str, list[int]]:
         (full_text, page_offsets) where page_offsets[i] is the character
         offset in full_text where page i begins.
     """
+    # Pages are read serially on purpose. PyMuPDF holds the GIL inside
+    # get_text and is not thread-safe, so a thread pool over pages (one
+    # Document per thread) measured no faster: 0.26s against 0.25s for 200
+    # pages. At roughly a millisecond a page, extraction is not where an
+    # ingest's time goes; contextualization is.
     doc = pymupdf.open(str(pdf_path))
     pages = []
     page_offsets: list[int] = []
     offset = 0
     for page in doc:
         page_offsets.append(offset)
-        text = page.get_text()
+        # Plain text in content-stream order: sort=False skips the reading
+        # order sort, and the flags are PyMuPDF's "text" defaults, spelled
+        # out so an upgrade cannot change what gets chunked.
+        text = page.get_text("text", sort=False, flags=pymupdf.TEXTFLAGS_TEXT)
         pages.append(text)
         # +2 for the "\n\n" separator between pages
         offset += len(text) + 2
@@ -56,24 +85,22 @@ def extract_text_from_pdf(pdf_path: Path) -> tuple[str, list[int]]:
     return "\n\n".join(pages), page_offsets
 
 
+# A PDF date is D:YYYYMMDDHHmmSS followed by a zone, with every field
+# after the year optional. Only the calendar date is kept.
+_PDF_DATE_RE = re.compile(r"(?:D:)?(\d{4})(\d{2})?(\d{2})?")
+
+
 def _parse_pdf_date(date_str: str) -> str | None:
     """Parse a PDF metadata date string (D:YYYYMMDDHHmmSS...) to ISO format."""
-    if not date_str:
+    match = _PDF_DATE_RE.match(date_str or "")
+    if match is None:
         return None
-    # Strip the D: prefix
-    s = date_str
-    if s.startswith("D:"):
-        s = s[2:]
-    # Remove timezone offset suffix (e.g. +05'30', -08'00', Z)
-    s = re.sub(r"[Z+-].*$", "", s)
-    # Try progressively shorter formats
-    for fmt in ("%Y%m%d%H%M%S", "%Y%m%d%H%M", "%Y%m%d", "%Y%m", "%Y"):
-        try:
-            dt = datetime.strptime(s[:len(fmt.replace("%", ""))], fmt)
-            return dt.strftime("%Y-%m-%d")
-        except (ValueError, IndexError):
-            continue
-    return None
+    year, month, day = match.groups()
+    try:
+        parsed = datetime(int(year), int(month or 1), int(day or 1))
+    except ValueError:
+        return None
+    return parsed.strftime("%Y-%m-%d")
 
 
 def extract_publish_date(pdf_path: Path) -> str | None:
@@ -115,11 +142,89 @@ def _page_range(chunk_start: int, chunk_end: int, page_offsets: list[int]) -> tu
     return page_start, page_end
 
 
+def split_with_offsets(text: str) -> list[tuple[int, int]]:
+    """text_splitter.split_text(text), as (start, end) offsets into text.
+
+    The same recursive algorithm as langchain's RecursiveCharacterTextSplitter
+    with text_splitter's settings (separators kept at the start of each
+    split, merged chunks whitespace-stripped), carried out on spans instead
+    of strings. Every chunk it emits is a slice of the text, so the slice
+    bounds are its position; recovering them afterwards meant searching for
+    each chunk, which could land on an earlier copy of a repeated passage.
+    """
+
+    def merge(splits: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        # langchain's _merge_splits with a zero-length separator: splits
+        # are contiguous, so a run of them is the span from first to last
+        merged: list[tuple[int, int]] = []
+        current: list[tuple[int, int]] = []
+        total = 0
+
+        def emit() -> None:
+            start, end = current[0][0], current[-1][1]
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if start < end:
+                merged.append((start, end))
+
+        for split in splits:
+            size = split[1] - split[0]
+            if total + size > CHUNK_SIZE and current:
+                emit()
+                while total > CHUNK_OVERLAP or (total + size > CHUNK_SIZE and total > 0):
+                    total -= current[0][1] - current[0][0]
+                    current = current[1:]
+            current.append(split)
+            total += size
+        if current:
+            emit()
+        return merged
+
+    def split(start: int, end: int, separators: list[str]) -> list[tuple[int, int]]:
+        piece = text[start:end]
+        separator, remaining = "", []
+        for index, candidate in enumerate(separators):
+            if not candidate or candidate in piece:
+                separator, remaining = candidate, separators[index + 1:] if candidate else []
+                break
+        if separator:
+            cuts = [start + m.start() for m in re.finditer(re.escape(separator), piece)]
+            bounds = [start, *cuts, end]
+            splits = [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+        else:
+            splits = [(i, i + 1) for i in range(start, end)]
+
+        chunks: list[tuple[int, int]] = []
+        good: list[tuple[int, int]] = []
+        for a, b in splits:
+            if b - a < CHUNK_SIZE:
+                good.append((a, b))
+                continue
+            if good:
+                chunks.extend(merge(good))
+                good = []
+            # An oversized split is kept as-is, unstripped, as langchain does
+            chunks.extend(split(a, b, remaining) if remaining else [(a, b)])
+        if good:
+            chunks.extend(merge(good))
+        return chunks
+
+    return split(0, len(text), _SEPARATORS)
+
+
+# A few entries: ingests run MAX_CONCURRENT_INGESTS at a time, and each
+# entry pins its whole document in memory until evicted.
+@lru_cache(maxsize=4)
 def document_prefix(whole_document: str) -> str:
     """The document text prepended to every chunk request for this document.
 
     Byte-identical across a document's chunks, which is what makes it
-    cacheable. Truncated because it is sent once per chunk.
+    cacheable. Truncated because it is sent once per chunk. Memoised so a
+    document's chunks share one truncated copy rather than slicing the
+    document again per request; the key is the same str object each time,
+    whose hash Python computes once.
     """
     truncated = whole_document[:CONTEXT_DOC_CHARS]
     if len(whole_document) > CONTEXT_DOC_CHARS:
@@ -131,6 +236,7 @@ async def contextualize_chunk(
     whole_document: str,
     chunk_content: str,
     budget: Budget,
+    span: tuple[int, int] | None = None,
 ) -> ModelResult:
     """
     Generate a contextual prefix for a chunk.
@@ -138,6 +244,10 @@ async def contextualize_chunk(
     The model reads the whole document + the specific chunk and produces
     a short blurb situating the chunk. This is prepended to the chunk
     before embedding.
+
+    span is the chunk's (start, end) in whole_document. A chunk starting
+    past the truncated document prefix also gets the text around it,
+    which otherwise never reaches the model.
     """
     # The document prefix is byte-identical across every chunk of this
     # document and is roughly 88% of each request, so it is sent as a
@@ -145,20 +255,186 @@ async def contextualize_chunk(
     # structure, so the bytes the model sees are the same and there is no
     # quality risk. CONTEXTUALIZER_PROMPT is already document-first, which
     # is what makes the prefix reusable.
-    prompt = Prompt.render(
-        CONTEXTUALIZER_PROMPT,
-        {
-            "whole_document": document_prefix(whole_document),
-            "chunk_content": chunk_content,
-        },
-        cache_after="whole_document",
-    )
+    fields = {
+        "whole_document": document_prefix(whole_document),
+        "chunk_content": chunk_content,
+    }
+    template = CONTEXTUALIZER_PROMPT
+    if span is not None and span[0] >= CONTEXT_DOC_CHARS:
+        # The nearby text goes after the cached block, so the prefix is
+        # still shared; it is only this chunk's uncached part that grows.
+        start, end = span
+        before = whole_document[max(CONTEXT_DOC_CHARS, start - _NEARBY_BEFORE_CHARS):start]
+        after = whole_document[end:end + _NEARBY_AFTER_CHARS]
+        fields["nearby_text"] = f"{before}\n[... the chunk ...]\n{after}"
+        template = CONTEXTUALIZER_NEARBY_PROMPT
+    prompt = Prompt.render(template, fields, cache_after="whole_document")
     return await complete(Purpose.CONTEXTUALIZE, prompt, budget)
 
 
+# A chunk more than this share digits is a table of numbers or a run of
+# references; a blurb situating it is not what makes it findable.
+_MAX_DIGIT_RATIO = 0.5
+
+
+def worth_contextualizing(text: str, min_chars: int = CONTEXTUALIZE_MIN_CHARS) -> bool:
+    """Whether a chunk earns a contextualization call.
+
+    ARCHITECTURE_V2 section 4's length gate, plus a digit-ratio check for
+    numeric tables. ingest_pdf passes the shorter PDF_CONTEXTUALIZE_MIN_CHARS
+    and gives a chunk that fails a templated context; index_item stores it
+    without one and marks it skipped.
+    """
+    if len(text) < min_chars:
+        return False
+    digits = sum(map(str.isdigit, text))
+    return digits <= len(text) * _MAX_DIGIT_RATIO
+
+
+def _templated_context(title: str, page: int) -> str:
+    return f"This excerpt is from '{title}' (page {page})."
+
+
+ContextKey = str | tuple[int, str]
+
+
+def context_key(chunk: str, start: int | None = None) -> ContextKey:
+    """What a context blurb is stored and reused under.
+
+    A blurb written from the document prefix alone depends only on the
+    chunk's text. Past CONTEXT_DOC_CHARS the request also carries the text
+    around the chunk, so the same text elsewhere in the document needs its
+    own blurb, and the key carries the chunk's offset as well.
+    """
+    if start is not None and start >= CONTEXT_DOC_CHARS:
+        return (start, chunk)
+    return chunk
+
+
+def known_contexts(collection, content_hash: str) -> dict[ContextKey, str]:
+    """Context blurbs already stored for a document, keyed by context_key.
+
+    A blurb depends only on the document and the chunk (and, past the
+    document prefix, the chunk's position), and the content hash pins the
+    document, so a re-ingest of the same bytes (a resume after an
+    interrupted run, a re-index) reuses them instead of paying for each
+    chunk's model call again.
+    """
+    if not content_hash:
+        return {}
+    stored = collection.get(
+        where={"content_hash": content_hash}, include=["documents", "metadatas"]
+    )
+    contexts: dict[ContextKey, str] = {}
+    for document, meta in zip(stored["documents"], stored["metadatas"]):
+        chunk = meta.get("original_chunk") or ""
+        if meta.get("context_status") == "ok" and chunk and document.endswith(f"\n\n{chunk}"):
+            contexts[context_key(chunk, meta.get("char_start"))] = document[:-len(chunk) - 2]
+    return contexts
+
+
+async def gather_or_cancel(*aws) -> None:
+    """asyncio.gather, except that the first failure cancels the rest.
+
+    Plain gather raises on the first exception and leaves its siblings
+    running: they keep paying for model calls, and their segments reach
+    a SegmentWriter that has already closed.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class SegmentWriter:
+    """Upserts one Item's segments in batches while they are still being made.
+
+    One upsert embeds its documents in a single model call and commits them
+    in one transaction, where a per-segment upsert paid both once per
+    segment, and held a contextualization slot while it did. A batch goes
+    out when it holds _UPSERT_BATCH segments or _UPSERT_WINDOW_S after its
+    first segment arrived, so the frontend progress bar still moves while
+    contextualization runs. Segments produced during an upsert queue up for
+    the next batch.
+
+    upsert rather than add: add is a silent no-op on an existing id, so a
+    re-ingest after an interrupted run could never repair the partial Item.
+    Embedding is CPU-bound and runs inside the call, so it goes off the
+    event loop.
+    """
+
+    def __init__(self, collection, label: str, total: int) -> None:
+        self._collection = collection
+        self._label = label
+        self._total = total
+        self._pending: asyncio.Queue[tuple[str, str, dict] | None] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        self.written = 0
+
+    async def __aenter__(self) -> "SegmentWriter":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Whatever was handed over is written even if production failed,
+        # as the per-segment upserts this replaced would have done.
+        self._closed = True
+        self._pending.put_nowait(None)
+        await self._task
+
+    def check(self) -> None:
+        """Raise the error that stopped the writer, if one has.
+
+        Producers call this before each model call: once a batch has failed
+        nothing will write their segments, so they must stop paying for them.
+        """
+        if self._task is not None and self._task.done() and not self._task.cancelled():
+            if (exc := self._task.exception()) is not None:
+                raise exc
+
+    def put(self, record_id: str, document: str, metadata: dict) -> None:
+        self.check()
+        if self._closed:
+            # Queued behind the sentinel, it would never be written.
+            raise RuntimeError(f"segment writer for {self._label} is closed")
+        self._pending.put_nowait((record_id, document, metadata))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished:
+            first = await self._pending.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + _UPSERT_WINDOW_S
+            while len(batch) < _UPSERT_BATCH:
+                try:
+                    record = await asyncio.wait_for(self._pending.get(), deadline - loop.time())
+                except TimeoutError:
+                    break
+                if record is None:
+                    finished = True
+                    break
+                batch.append(record)
+            ids, documents, metadatas = (list(column) for column in zip(*batch))
+            await asyncio.to_thread(
+                self._collection.upsert, ids=ids, documents=documents, metadatas=metadatas
+            )
+            if any(meta["chunk_index"] == 0 for meta in metadatas):
+                invalidate_heads()
+            self.written += len(batch)
+            logger.info(f"Wrote segment {self.written}/{self._total} for {self._label}")
+
+
 def _pick_subtitle(title: str) -> str:
     """If the title has a colon/dash separator, return the part after it."""
-    for sep in [":", " - ", " — ", " – "]:
+    for sep in SUBTITLE_SEPARATORS:
         if sep in title:
             after = title.split(sep, 1)[1].strip()
             if after:
@@ -166,6 +442,11 @@ def _pick_subtitle(title: str) -> str:
     return title
 
 
+# A page-1 line that can stand as a title: 4 to 120 characters once
+# stripped, and not a bare number (a page or line number).
+_TITLE_CANDIDATE_RE = re.compile(r"(?!\d+$).{4,120}")
+
+
 def generate_title_from_pdf(pdf_path: Path) -> str:
     """Extract a suggested title from a PDF — fast, only reads metadata + page 1."""
     try:
@@ -179,13 +460,13 @@ def generate_title_from_pdf(pdf_path: Path) -> str:
 
         # Heuristic: first non-empty short line from page 1
         if doc.page_count > 0:
-            first_page = doc[0].get_text()
+            first_page = doc[0].get_text("text", sort=False, flags=pymupdf.TEXTFLAGS_TEXT)
             doc.close()
-            for line in first_page.split("\n")[:20]:
+            # maxsplit: only the first 20 lines are read, so the rest of
+            # the page is never split into lines
+            for line in first_page.split("\n", 20)[:20]:
                 candidate = line.strip()
-                if not candidate or len(candidate) < 4 or candidate.isdigit():
-                    continue
-                if len(candidate) <= 120:
+                if _TITLE_CANDIDATE_RE.fullmatch(candidate):
                     return _pick_subtitle(candidate)
         else:
             doc.close()
@@ -218,116 +499,161 @@ async def ingest_pdf(
     filename = Path(item.raw_ref).name
     logger.info(f"Ingesting PDF: {filename} (id={item.id})")
 
-    # Step 1: Extract text with page boundaries
-    full_text, page_offsets = extract_text_from_pdf(pdf_path)
+    # Step 1: Extract text with page boundaries. On a worker thread: a long
+    # PDF takes seconds, and in the coroutine that stalled every request
+    # and every other ingest. The GIL is released between pages, so the
+    # loop keeps running alongside.
+    full_text, page_offsets = await asyncio.to_thread(extract_text_from_pdf, pdf_path)
     if not full_text.strip():
         logger.warning(f"No text extracted from {filename}")
         return 0
 
-    # Step 2: Split into chunks and track their positions in full_text
-    chunks = text_splitter.split_text(full_text)
+    # Step 2: Split into chunks and track their positions in full_text,
+    # and the pages each one spans. Pure-Python CPU work over the whole
+    # text, so also off the loop, and done once here rather than per chunk
+    # in the concurrent stage below.
+    def _split() -> tuple[list[str], list[tuple[int, int]], list[tuple[int, int]]]:
+        positions = split_with_offsets(full_text)
+        return (
+            [full_text[start:end] for start, end in positions],
+            positions,
+            [_page_range(start, end, page_offsets) for start, end in positions],
+        )
+
+    chunks, chunk_positions, page_ranges = await asyncio.to_thread(_split)
     logger.info(f"Split into {len(chunks)} chunks")
 
-    # Build chunk start offsets by finding each chunk in the full text
-    chunk_positions: list[tuple[int, int]] = []
-    search_start = 0
-    for chunk in chunks:
-        pos = full_text.find(chunk, search_start)
-        if pos == -1:
-            # Fallback: if exact match fails (due to overlap trimming), use last known position
-            pos = search_start
-        chunk_positions.append((pos, pos + len(chunk)))
-        # Advance past the start of this chunk for next search
-        search_start = pos + 1
-
     # Step 3-5: Contextualize chunks and insert into ChromaDB incrementally
     collection = get_collection()
+    contexts = await asyncio.to_thread(known_contexts, collection, item.source_id)
     # Ingest is background work: it may process the document it was handed
     # and may not reach into a live session's state. Budget.background is
     # what makes that structural rather than a convention.
     budget = Budget.background("ingest", max_calls=len(chunks))
     chunk_tags = tags or []
     embedding_model = current_embedding_model_id()
-    ingested = 0
     failed = 0
+    reused = 0
     doc_input_tokens = 0
     doc_output_tokens = 0
     doc_cache_read_tokens = 0
     doc_cost_usd = 0.0
 
-    # Semaphore limits concurrent API requests
+    # Semaphore limits concurrent API requests; only the model call holds it
     sem = asyncio.Semaphore(4)
+    # Set once the request for that context key has finished, successful or not
+    inflight: dict[ContextKey, asyncio.Event] = {}
 
     async def _contextualize_and_insert(i: int, chunk: str) -> None:
-        nonlocal ingested, failed
+        nonlocal failed, reused
         nonlocal doc_input_tokens, doc_output_tokens, doc_cache_read_tokens, doc_cost_usd
-        async with sem:
+        # A chunk identical to one already claimed (a running header, a
+        # repeated notice) waits for that request's context instead of
+        # paying for its own, and waits outside the semaphore so it holds
+        # no request slot. If that request failed, it tries itself.
+        # Past the document prefix the key includes the chunk's offset, so
+        # only a repeat that would get the same prompt shares its context.
+        eligible = worth_contextualizing(chunk, PDF_CONTEXTUALIZE_MIN_CHARS)
+        key = context_key(chunk, chunk_positions[i][0])
+        done = None
+        if eligible and key not in contexts:
+            if key in inflight:
+                await inflight[key].wait()
+            else:
+                inflight[key] = done = asyncio.Event()
+        if not eligible:
+            # Too short or too numeric for a model blurb to pay off, but
+            # the title and page still tell retrieval where it came from.
+            # "templated" rather than "ok", so known_contexts never reuses
+            # it as a model-written context.
+            contextualized = f"{_templated_context(item.title, page_ranges[i][0])}\n\n{chunk}"
+            context_status = "templated"
+        elif (context := contexts.get(key)) is not None:
+            contextualized = f"{context}\n\n{chunk}"
+            context_status = "ok"
+            reused += 1
+        else:
             try:
-                result = await contextualize_chunk(full_text, chunk, budget)
+                async with sem:
+                    writer.check()
+                    result = await contextualize_chunk(
+                        full_text, chunk, budget, span=chunk_positions[i]
+                    )
                 contextualized = f"{result.text}\n\n{chunk}"
                 context_status = "ok"
+                contexts[key] = result.text
                 doc_input_tokens += result.input_tokens
                 doc_output_tokens += result.output_tokens
                 doc_cache_read_tokens += result.cache_read_tokens
                 doc_cost_usd += result.cost_usd
             except Exception as e:
-                # A failed contextualization is billed and buys nothing, so
-                # it is counted rather than only logged per chunk.
+                # The writer's own failure ends the ingest; anything else
+                # failed this chunk only.
+                writer.check()
+                # A failed contextualization is billed and buys nothing,
+                # so it is counted rather than only logged per chunk.
                 logger.warning(f"Contextualization failed for chunk {i+1}: {e}")
                 contextualized = chunk
                 context_status = "failed"
                 failed += 1
-
-            # Compute page range for this chunk
-            c_start, c_end = chunk_positions[i]
-            p_start, p_end = _page_range(c_start, c_end, page_offsets)
-
-            # content_source describes the citable text, which is the
-            # chunk verbatim: original_chunk below, and what services.rag
-            # returns as `text`. Contextualisation prepends a blurb to the
-            # embedded string only, and context_status is what records
-            # that. See the Segment docstring for why the two cannot share
-            # one field.
-            segment = Segment(
-                ordinal=i,
-                modality="text",
-                content=contextualized,
-                content_source="extracted",
-                embedding_model=embedding_model,
-                context_status=context_status,
-                span={"page_start": p_start, "page_end": p_end},
-            )
-
-            # Insert immediately so frontend progress bar updates in real time.
-            # upsert rather than add: add is a silent no-op on an existing id,
-            # so a re-ingest after an interrupted run could never repair the
-            # partial Item. segment_total lets item_completion() tell a
-            # truncated Item from a complete one. Embedding is CPU-bound and
-            # runs inside the call, so it goes off the event loop.
-            await asyncio.to_thread(
-                collection.upsert,
-                ids=[segment_id(item.id, i)],
-                documents=[segment.content],
-                metadatas=[segment_metadata(item, segment, extra={
-                    "filename": filename,
-                    "original_chunk": chunk,
-                    "tags": chunk_tags,
-                    "content_hash": item.source_id,
-                    "publish_date": item.created_at,
-                    "segment_total": len(chunks),
-                })],
-            )
-            ingested += 1
-            logger.info(f"Ingested chunk {ingested}/{len(chunks)} for {filename}")
-
-    await asyncio.gather(*[
-        _contextualize_and_insert(i, chunk) for i, chunk in enumerate(chunks)
-    ])
+            finally:
+                if done is not None:
+                    done.set()
+
+        p_start, p_end = page_ranges[i]
+
+        # content_source describes the citable text, which is the
+        # chunk verbatim: original_chunk below, and what services.rag
+        # returns as `text`. Contextualisation prepends a blurb to the
+        # embedded string only, and context_status is what records
+        # that. See the Segment docstring for why the two cannot share
+        # one field.
+        segment = Segment(
+            ordinal=i,
+            modality="text",
+            content=contextualized,
+            content_source="extracted",
+            embedding_model=embedding_model,
+            context_status=context_status,
+            span={"page_start": p_start, "page_end": p_end, "char_start": chunk_positions[i][0]},
+        )
+
+        # Handed to the batch writer rather than upserted here, so no
+        # model call waits behind a Chroma write.
+        # segment_total lets item_completion() tell a truncated Item
+        # from a complete one.
+        writer.put(segment_id(item.id, i), segment.content, segment_metadata(item, segment, extra={
+            "filename": filename,
+            "original_chunk": chunk,
+            "tags": chunk_tags,
+            "content_hash": item.source_id,
+            "publish_date": item.created_at,
+            "segment_total": len(chunks),
+        }))
+
+    async with SegmentWriter(collection, filename, len(chunks)) as writer:
+        # The first request writes the document prefix to the prompt cache,
+        # and the cache entry only exists once that response starts. Fanned
+        # out with the rest, the first four requests all missed and each
+        # paid full prefill plus a cache write; sent alone, every later
+        # chunk reads it. A templated chunk or one with a known context makes
+        # no request, so the first chunk that does is the one sent alone.
+        first = next((
+            i for i, chunk in enumerate(chunks)
+            if context_key(chunk, chunk_positions[i][0]) not in contexts
+            and worth_contextualizing(chunk, PDF_CONTEXTUALIZE_MIN_CHARS)
+        ), None)
+        if first is not None:
+            await _contextualize_and_insert(first, chunks[first])
+        await gather_or_cancel(*[
+            _contextualize_and_insert(i, chunk) for i, chunk in enumerate(chunks) if i != first
+        ])
+    ingested = writer.written
 
     logger.info(f"Finished ingesting {ingested} contextualized chunks for {filename}")
     logger.info(
-        "[COST] ingest %s: %d chunks (%d failed), %d in (%d cache read) / %d out, $%.4f",
-        filename, ingested, failed, doc_input_tokens, doc_cache_read_tokens,
+        "[COST] ingest %s: %d chunks (%d failed, %d reused), %d in (%d cache read) / %d out, $%.4f",
+        filename, ingested, failed, reused, doc_input_tokens, doc_cache_read_tokens,
         doc_output_tokens, doc_cost_usd,
     )
     return ingested
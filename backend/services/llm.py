@@ -7,13 +7,17 @@ advisory: a new call site cannot opt out without adding a second
 construction, which tests/test_budget_enforcement.py fails on.
 """
 
+import asyncio
 import logging
 import re
+import string
 import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import StrEnum
+from functools import lru_cache
+from collections.abc import AsyncIterator
 from typing import Any
 
 from langchain_anthropic import ChatAnthropic
@@ -69,7 +73,8 @@ CONTEXT_FIELDS = frozenset({
 # draws: background work may process what it was handed, and may not reach
 # into the conversation.
 CONTEXT_FREE_FIELDS = frozenset({
-    "whole_document", "chunk_content", "mode_instruction", "action_protocol",
+    "whole_document", "chunk_content", "nearby_text", "mode_instruction",
+    "action_protocol",
 })
 
 # Case-insensitive on purpose. A lowercase-only pattern let {History} slip
@@ -127,7 +132,7 @@ class Prompt:
         so cache_prefix + text is byte-identical to the whole rendered
         prompt while the prefix stays constant across calls.
         """
-        used = tuple(sorted(set(_PLACEHOLDER.findall(template)) & set(fields)))
+        used = tuple(sorted(_template_fields(template) & fields.keys()))
         unclassified = [
             f for f in used
             if f not in CONTEXT_FIELDS and f not in CONTEXT_FREE_FIELDS
@@ -176,6 +181,15 @@ class Prompt:
         ])]
 
 
+@lru_cache(maxsize=64)
+def _template_fields(template: str) -> frozenset[str]:
+    return frozenset(_PLACEHOLDER.findall(template))
+
+
+# Cached so a template is cut once rather than searched again for every
+# chunk of every document; each half then renders through its own
+# compiled parts, which keeps the document a single copy per render.
+@lru_cache(maxsize=64)
 def _split_template(template: str, cache_after: str | None) -> tuple[str | None, str]:
     if cache_after is None:
         return None, template
@@ -187,14 +201,67 @@ def _split_template(template: str, cache_after: str | None) -> tuple[str | None,
     return template[:cut], template[cut:]
 
 
+# A compiled template alternates literal text (str) with placeholder names
+# (a one-element tuple), so rendering is one join over a precomputed list
+# instead of re-tokenising the template on every call. The prompts are a
+# closed set of module constants, so the cache never grows past it.
+_Compiled = tuple[str | tuple[str], ...]
+
+
+@lru_cache(maxsize=64)
+def _compile_format(template: str) -> _Compiled | None:
+    """Pre-parse a str.format template, or None if it needs str.format itself.
+
+    Only bare {name} placeholders are compiled. Format specs, conversions,
+    positional fields and attribute or index lookups are left to
+    str.format rather than reimplemented here.
+    """
+    parts: list[str | tuple[str]] = []
+    for literal, name, spec, conversion in string.Formatter().parse(template):
+        if literal:
+            parts.append(literal)
+        if name is None:
+            continue
+        if spec or conversion or not name.isidentifier():
+            return None
+        parts.append((name,))
+    return tuple(parts)
+
+
+@lru_cache(maxsize=64)
+def _compile_replace(template: str) -> _Compiled:
+    """Pre-split a replace-mode template at its {identifier} placeholders.
+
+    Braces that do not enclose an identifier, like the literal JSON in
+    FINAL_RESPONSE_WITH_ACTIONS_PROMPT, stay in the literal text.
+    """
+    parts: list[str | tuple[str]] = []
+    for i, piece in enumerate(_PLACEHOLDER.split(template)):
+        if i % 2:
+            parts.append((piece,))
+        elif piece:
+            parts.append(piece)
+    return tuple(parts)
+
+
 def _substitute(template: str, fields: dict[str, str], mode: str) -> str:
     if mode == "format":
-        return template.format(**fields)
+        compiled = _compile_format(template)
+        if compiled is None:
+            return template.format(**fields)
+        return "".join(
+            part if type(part) is str else format(fields[part[0]])
+            for part in compiled
+        )
     if mode == "replace":
-        out = template
-        for key, value in fields.items():
-            out = out.replace("{" + key + "}", value)
-        return out
+        # One pass over the template: a value that itself contains
+        # "{name}" (a user's query, a retrieved chunk) is never expanded.
+        return "".join(
+            part if type(part) is str
+            else fields[part[0]] if part[0] in fields
+            else "{" + part[0] + "}"
+            for part in _compile_replace(template)
+        )
     raise ValueError(f"unknown render mode {mode!r}")
 
 
@@ -522,6 +589,81 @@ def _failed_result(spec: ModelSpec, elapsed: float) -> ModelResult:
     )
 
 
+# One ChatAnthropic per ModelSpec, so every call for the same model and
+# sampling settings reuses one client and its pooled connections instead
+# of validating a new config and opening a fresh TLS session each time.
+# The async transport belongs to the loop it was first used on, so the
+# set is rebuilt when a different loop asks.
+_chat_models: dict[ModelSpec, ChatAnthropic] = {}
+_chat_models_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _chat_model(spec: ModelSpec) -> ChatAnthropic:
+    global _chat_models_loop
+    loop = asyncio.get_running_loop()
+    if _chat_models_loop is not loop:
+        _chat_models.clear()
+        _chat_models_loop = loop
+    llm = _chat_models.get(spec)
+    if llm is None:
+        llm = _chat_models[spec] = ChatAnthropic(
+            model=spec.model,
+            api_key=ANTHROPIC_API_KEY,
+            temperature=spec.temperature,
+            max_tokens=spec.max_tokens,
+        )
+    return llm
+
+
+def _require_api_key() -> None:
+    if not ANTHROPIC_API_KEY:
+        raise RuntimeError(
+            "ANTHROPIC_API_KEY is not set. Set it, or set ORIGAMI_MODEL_STUB=1 "
+            "to run the pipeline against local stubs."
+        )
+
+
+async def _settle_failed(
+    purpose: Purpose,
+    budget: Budget,
+    prompt: Prompt,
+    spec: ModelSpec,
+    loop: int,
+    elapsed: float,
+    exc: BaseException,
+) -> None:
+    # authorize() already spent the budget slot, so returning here
+    # without a row let the turn's call count exceed its ledger rows and
+    # made ingest's [COST] line understate a document by exactly its
+    # failed chunks, the chunks its own comment calls billed.
+    logger.error(
+        "[COST] %s route=%s model=%s FAILED after %.3fs, recorded unpriced: %s",
+        purpose.value, budget.route or "-", spec.model, elapsed, exc or type(exc).__name__,
+    )
+    await _record_call(
+        purpose, budget, prompt, _failed_result(spec, elapsed), loop, failed=True
+    )
+
+
+async def _settle(
+    purpose: Purpose,
+    budget: Budget,
+    prompt: Prompt,
+    spec: ModelSpec,
+    loop: int,
+    elapsed: float,
+    response: Any,
+) -> ModelResult:
+    result = _to_result(response, spec, elapsed, MODEL_STUB)
+    await _record_call(purpose, budget, prompt, result, loop, failed=False)
+    logger.info(
+        "[COST] %s route=%s model=%s %d in (%d cached) / %d out — $%.6f in %.3fs",
+        purpose.value, budget.route or "-", result.model, result.input_tokens,
+        result.cache_read_tokens, result.output_tokens, result.cost_usd, elapsed,
+    )
+    return result
+
+
 async def complete(
     purpose: Purpose,
     prompt: Prompt,
@@ -547,39 +689,77 @@ async def complete(
             )
             response: Any = _stub_response(purpose, prompt)
         else:
-            if not ANTHROPIC_API_KEY:
-                raise RuntimeError(
-                    "ANTHROPIC_API_KEY is not set. Set it, or set ORIGAMI_MODEL_STUB=1 "
-                    "to run the pipeline against local stubs."
-                )
-            llm = ChatAnthropic(
-                model=spec.model,
-                api_key=ANTHROPIC_API_KEY,
-                temperature=spec.temperature,
-                max_tokens=spec.max_tokens,
-            )
-            response = await llm.ainvoke(prompt.to_messages())
-    except Exception as exc:
-        # authorize() already spent the budget slot, so returning here
-        # without a row let the turn's call count exceed its ledger rows and
-        # made ingest's [COST] line understate a document by exactly its
-        # failed chunks, the chunks its own comment calls billed.
-        elapsed = time.perf_counter() - t0
-        logger.error(
-            "[COST] %s route=%s model=%s FAILED after %.3fs, recorded unpriced: %s",
-            purpose.value, budget.route or "-", spec.model, elapsed, exc,
-        )
-        await _record_call(
-            purpose, budget, prompt, _failed_result(spec, elapsed), loop, failed=True
+            _require_api_key()
+            response = await _chat_model(spec).ainvoke(prompt.to_messages())
+    except BaseException as exc:
+        # BaseException, so a call cancelled mid-flight (ingest cancels its
+        # sibling requests when one fails) still gets its row.
+        await _settle_failed(
+            purpose, budget, prompt, spec, loop, time.perf_counter() - t0, exc
         )
         raise
-    elapsed = time.perf_counter() - t0
-
-    result = _to_result(response, spec, elapsed, MODEL_STUB)
-    await _record_call(purpose, budget, prompt, result, loop, failed=False)
-    logger.info(
-        "[COST] %s route=%s model=%s %d in (%d cached) / %d out — $%.6f in %.3fs",
-        purpose.value, budget.route or "-", result.model, result.input_tokens,
-        result.cache_read_tokens, result.output_tokens, result.cost_usd, elapsed,
+    return await _settle(
+        purpose, budget, prompt, spec, loop, time.perf_counter() - t0, response
     )
-    return result
+
+
+async def stream_complete(
+    purpose: Purpose,
+    prompt: Prompt,
+    budget: Budget,
+    *,
+    loop: int = 0,
+    has_notes: bool = True,
+) -> AsyncIterator[str | ModelResult]:
+    """complete(), streamed: yields text deltas as they arrive, then the
+    call's ModelResult as the last item.
+
+    Authorization, routing, recording and the [COST] line are the same as
+    complete()'s; only the transport differs. The deltas are raw model
+    output, so a caller that shows them must pass them through a
+    text_utils.ThinkTagFilter; the ModelResult's text is stripped as usual.
+
+    A stream abandoned part-way, by a client disconnect, a cancellation or
+    an early aclose(), still gets its ledger row, as a failed one: the
+    input was billed and the usage block that would price it never came.
+    """
+    budget.authorize(purpose, prompt)
+    spec = resolve_model(purpose, budget.route, has_notes=has_notes)
+    seq = budget.calls_made
+
+    t0 = time.perf_counter()
+    settled = False
+    try:
+        response: Any = None
+        if MODEL_STUB:
+            await usage.dump_request(
+                budget.turn_id, seq, purpose.value, _request_payload(purpose, spec, prompt)
+            )
+            response = _stub_response(purpose, prompt)
+            yield _response_text(response.content)
+        else:
+            _require_api_key()
+            # Chunks add up to one message carrying the usage block and the
+            # reported model id, which is what _to_result reads.
+            async for chunk in _chat_model(spec).astream(prompt.to_messages()):
+                response = chunk if response is None else response + chunk
+                delta = _response_text(chunk.content)
+                if delta:
+                    yield delta
+        if response is None:
+            raise RuntimeError(f"{spec.model} returned an empty stream")
+        # Set before the await, so a cancellation inside _settle cannot
+        # add a second, failed row for the same call.
+        settled = True
+        result = await _settle(
+            purpose, budget, prompt, spec, loop, time.perf_counter() - t0, response
+        )
+    except BaseException as exc:
+        # BaseException, not Exception: GeneratorExit and CancelledError
+        # end a paid call just as surely as a provider error does.
+        if not settled:
+            await _settle_failed(
+                purpose, budget, prompt, spec, loop, time.perf_counter() - t0, exc
+            )
+        raise
+    yield result
@@ -4,9 +4,11 @@ Vector search over contextualized chunks stored in ChromaDB.
 Embedding model is configured in services/embeddings.py (currently BAAI/bge-small-en-v1.5).
 """
 
+import asyncio
 from typing import Any
 
 from services.chroma import get_collection
+from services.embeddings import embed_query
 from services.schema import read_schema_fields
 
 
@@ -35,16 +37,26 @@ async def vector_search(
     system ends up citing a sentence nobody wrote.
     """
     collection = get_collection()
-    if collection.count() == 0:
-        return []
-
     where = {"file_id": {"$in": file_ids}} if file_ids else None
 
-    results = collection.query(
-        query_texts=[query],
-        n_results=min(n_results, collection.count()),
-        where=where,
-    )
+    # Embedded here rather than by the collection so a repeated query
+    # reuses its vector, and concurrent searches share one model call,
+    # instead of running the model per query. Both the embed and the index
+    # search are CPU-bound, so they run off the event loop, which is also
+    # what lets the agent overlap a search with a model call.
+    vector = list(await embed_query(query))
+
+    # No count() first: query already clamps n_results to what the index
+    # holds and answers an empty collection with empty lists, so the two
+    # COUNT(*) round-trips per search bought nothing.
+    def _query():
+        return collection.query(
+            query_embeddings=[vector],
+            n_results=n_results,
+            where=where,
+        )
+
+    results = await asyncio.to_thread(_query)
 
     chunks = []
     if results["documents"] and results["documents"][0]:
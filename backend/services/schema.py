@@ -19,7 +19,7 @@ Modality = Literal["text", "ocr", "caption", "transcript"]
 ContentSource = Literal["extracted", "generated"]
 Origin = Literal["self", "counterparty", "public", "unknown"]
 Trust = Literal["trusted", "untrusted"]
-ContextStatus = Literal["ok", "failed", "skipped", "unknown"]
+ContextStatus = Literal["ok", "templated", "failed", "skipped", "unknown"]
 
 
 @dataclass(frozen=True)
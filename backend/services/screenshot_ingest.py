@@ -10,7 +10,7 @@ import logging
 from datetime import datetime, timezone
 from pathlib import Path
 
-from services.chroma import hash_bytes
+from services.chroma import hash_file
 from services.indexing import SegmentDraft, index_item
 from services.ingest import text_splitter
 from services.schema import Item, data_relative, provenance_for_screenshot
@@ -40,7 +40,7 @@ def screenshot_item(path: Path, vision_result: dict) -> Item:
     return Item(
         id=path.name,
         source_type="screenshot",
-        source_id=hash_bytes(path.read_bytes()),
+        source_id=hash_file(path),
         title=as_text(vision_result.get("title")) or DEFAULT_TITLE,
         created_at="",
         ingested_at=datetime.now(timezone.utc).isoformat(),
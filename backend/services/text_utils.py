@@ -11,6 +11,54 @@ def strip_think_tags(text: str) -> str:
     return _THINK_TAG_RE.sub("", text).strip()
 
 
+class ThinkTagFilter:
+    """strip_think_tags() for a stream of deltas.
+
+    A tag can arrive split across deltas ("<thi" then "nk>"), so the tail of
+    a delta that could still be the start of one is held back until the next
+    delta settles it. Each delta is scanned once from where the last scan
+    stopped, so a long stream costs linear time rather than a rescan of the
+    whole buffer per delta.
+    """
+
+    _OPEN, _CLOSE = "<think>", "</think>"
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._inside = False
+
+    def feed(self, delta: str) -> str:
+        """Take the next delta; return the text now known to be outside a block."""
+        text = self._pending + delta
+        out: list[str] = []
+        pos = 0
+        while True:
+            tag = self._CLOSE if self._inside else self._OPEN
+            found = text.find(tag, pos)
+            if found < 0:
+                break
+            if not self._inside:
+                out.append(text[pos:found])
+            pos = found + len(tag)
+            self._inside = not self._inside
+        # Hold back the longest suffix that is a prefix of the awaited tag
+        keep = 0
+        for size in range(min(len(tag) - 1, len(text) - pos), 0, -1):
+            if tag.startswith(text[len(text) - size:]):
+                keep = size
+                break
+        end = len(text) - keep
+        if not self._inside:
+            out.append(text[pos:end])
+        self._pending = text[end:]
+        return "".join(out)
+
+    def flush(self) -> str:
+        """End of stream: release a held-back tail that never became a tag."""
+        tail, self._pending = self._pending, ""
+        return "" if self._inside else tail
+
+
 def as_text(value: object) -> str:
     """Coerce one field of a model's JSON output to a string.
 
@@ -139,22 +187,32 @@ _ACRONYMS: dict[str, str] = {
     "feedback": "fb",
 }
 
+# The multi-word keys of _ACRONYMS as one alternation, so shorten_title
+# makes a single pass instead of testing every key against the title.
+_MULTIWORD_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase in _ACRONYMS if " " in phrase)
+)
+
+
+# What separates a title from its subtitle, in priority order: a title
+# holding several is split at the first of these it contains, not at
+# whichever comes first in the title.
+SUBTITLE_SEPARATORS = (":", " - ", " — ", " – ")
+
 
 def shorten_title(title: str, max_words: int = 5) -> str:
     """Condense a long title to ~5 key words with abbreviations."""
     # Strip subtitle after colon/dash
-    for sep in [":", " - ", " — ", " – "]:
+    for sep in SUBTITLE_SEPARATORS:
         if sep in title:
-            title = title.split(sep)[0].strip()
+            title = title.split(sep, 1)[0].strip()
             break
 
     words = title.split()
 
     # Try multi-word phrases first (e.g. "chain of thought" -> "cot")
     title_lower = " ".join(w.lower().strip(".,;()[]") for w in words)
-    for phrase, abbrev in _ACRONYMS.items():
-        if " " in phrase and phrase in title_lower:
-            title_lower = title_lower.replace(phrase, abbrev)
+    title_lower = _MULTIWORD_RE.sub(lambda m: _ACRONYMS[m.group(0)], title_lower)
     words = title_lower.split()
 
     # Drop stopwords, abbreviate known terms
@@ -179,10 +237,13 @@ def shorten_title(title: str, max_words: int = 5) -> str:
     return " ".join(final) if final else title.split()[0]
 
 
+# One greedy run per match, and "-" is itself outside the class, so a run
+# of separators and hyphens collapses to a single "-" in one pass.
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
 def sanitize_filename(name: str) -> str:
     """Convert a human-readable name into a safe filename slug."""
     name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
-    name = name.lower().strip()
-    name = re.sub(r"[^a-z0-9]+", "-", name)
-    name = re.sub(r"-+", "-", name).strip("-")
+    name = _SLUG_RE.sub("-", name.lower()).strip("-")
     return name[:80] if name else "untitled"
@@ -1,5 +1,6 @@
 """Ollama VLM client for screenshot analysis."""
 
+import asyncio
 import base64
 import json
 import logging
@@ -9,7 +10,7 @@ from datetime import datetime, timezone
 
 import httpx
 
-from config import OLLAMA_URL, OLLAMA_VLM_MODEL, OLLAMA_TIMEOUT
+from config import OLLAMA_KEEP_ALIVE, OLLAMA_URL, OLLAMA_VLM_MODEL, OLLAMA_TIMEOUT
 from services import usage
 
 logger = logging.getLogger(__name__)
@@ -26,17 +27,50 @@ Analyze this screenshot and return a JSON object with these fields:
 Return ONLY valid JSON, no markdown fences or extra text."""
 
 
+# One client for every Ollama request, so a batch of screenshots reuses
+# pooled keep-alive connections instead of opening one per image. An
+# AsyncClient's connections belong to the event loop that opened them,
+# so a call from a different loop gets a fresh client. OLLAMA_TIMEOUT is
+# sized for a VLM generating; connecting gets its own short limit, so an
+# unreachable OLLAMA_URL fails in seconds rather than after a generation's
+# worth of waiting.
+_CONNECT_TIMEOUT_S = 5.0
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _ollama_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=OLLAMA_URL,
+            timeout=httpx.Timeout(OLLAMA_TIMEOUT, connect=_CONNECT_TIMEOUT_S),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client. Called from the app's lifespan shutdown."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
 async def check_ollama_health() -> bool:
     """Check if Ollama is running and the VLM model is available."""
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            resp = await client.get(f"{OLLAMA_URL}/api/tags")
-            if resp.status_code != 200:
-                return False
-            models = [m["name"] for m in resp.json().get("models", [])]
-            # Check if model is available (with or without :latest suffix)
-            base = OLLAMA_VLM_MODEL.split(":")[0]
-            return any(m.startswith(base) for m in models)
+        resp = await _ollama_client().get("/api/tags", timeout=5)
+        if resp.status_code != 200:
+            return False
+        models = [m["name"] for m in resp.json().get("models", [])]
+        # Check if model is available (with or without :latest suffix)
+        base = OLLAMA_VLM_MODEL.split(":")[0]
+        return any(m.startswith(base) for m in models)
     except Exception:
         return False
 
@@ -110,6 +144,9 @@ async def analyze_screenshot(image_path) -> dict:
     image_bytes = image_path.read_bytes()
     image_b64 = base64.b64encode(image_bytes).decode("ascii")
 
+    # The instructions stay in the user turn with the image: many Ollama
+    # vision templates attend far less to a system message, and a prompt
+    # prefix shared across screenshots is not worth a worse analysis.
     payload = {
         "model": OLLAMA_VLM_MODEL,
         "messages": [
@@ -120,12 +157,12 @@ async def analyze_screenshot(image_path) -> dict:
             }
         ],
         "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "options": {"temperature": 0.1},
     }
 
-    async with httpx.AsyncClient(timeout=OLLAMA_TIMEOUT) as client:
-        resp = await client.post(f"{OLLAMA_URL}/api/chat", json=payload)
-        resp.raise_for_status()
+    resp = await _ollama_client().post("/api/chat", json=payload)
+    resp.raise_for_status()
 
     body = resp.json()
     await _record_vlm_usage(body, len(_ANALYZE_PROMPT) + len(image_b64))
@@ -60,20 +60,23 @@ def fake_collection(monkeypatch):
             return -1
 
         def upsert(self, ids, documents, metadatas):
-            record = (ids[0], documents[0], metadatas[0])
-            position = self._index_of(ids[0])
-            if position >= 0:
-                self.records[position] = record
-            else:
-                self.records.append(record)
+            for record in zip(ids, documents, metadatas):
+                position = self._index_of(record[0])
+                if position >= 0:
+                    self.records[position] = record
+                else:
+                    self.records.append(record)
 
         def get(self, where=None, include=None):
-            file_id = (where or {}).get("file_id")
             matched = [
                 record for record in self.records
-                if file_id is None or record[2].get("file_id") == file_id
+                if all(record[2].get(key) == value for key, value in (where or {}).items())
             ]
-            return {"ids": [record[0] for record in matched]}
+            return {
+                "ids": [record[0] for record in matched],
+                "documents": [record[1] for record in matched],
+                "metadatas": [record[2] for record in matched],
+            }
 
         def delete(self, ids):
             self.records = [record for record in self.records if record[0] not in set(ids)]
@@ -0,0 +1,61 @@
+"""The /api/chats sidebar listing and its directory-mtime cache.
+
+Rewriting a chat file in place does not move the directory's mtime, so
+the cache is only correct if every write path invalidates it as well.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config import CHATS_DIR
+import routes.chats as chats
+
+
+@pytest.fixture
+def client():
+    for path in CHATS_DIR.iterdir():
+        path.unlink()
+    chats._invalidate_chats()
+
+    app = FastAPI()
+    app.include_router(chats.router, prefix="/api")
+    return TestClient(app)
+
+
+def _user_message(text: str) -> dict:
+    return {"id": "m1", "role": "user", "parts": [{"type": "text", "text": text}]}
+
+
+def test_an_in_place_update_is_visible_in_the_listing(client):
+    chat_id = client.post("/api/chats", json={}).json()["id"]
+    assert client.get("/api/chats").json()[0]["message_count"] == 0
+
+    client.put(f"/api/chats/{chat_id}", json={"messages": [_user_message("what is attention")]})
+
+    listed = client.get("/api/chats").json()
+    assert listed[0]["message_count"] == 1
+    assert listed[0]["title"] == "what is attention"
+
+
+def test_create_and_delete_are_visible_in_the_listing(client):
+    first = client.post("/api/chats", json={"title": "one"}).json()["id"]
+    client.get("/api/chats")
+    second = client.post("/api/chats", json={"title": "two"}).json()["id"]
+
+    assert {c["id"] for c in client.get("/api/chats").json()} == {first, second}
+
+    client.delete(f"/api/chats/{first}")
+
+    assert [c["id"] for c in client.get("/api/chats").json()] == [second]
+
+
+def test_a_missing_chat_is_a_404(client):
+    assert client.get("/api/chats/0123456789").status_code == 404
+    assert client.delete("/api/chats/0123456789").status_code == 404
+
+
+@pytest.mark.parametrize("chat_id", ["a.b", "..a", "a-b", "é1", "x" * 33])
+def test_an_id_that_is_not_short_ascii_alphanumeric_is_refused(client, chat_id):
+    assert client.get(f"/api/chats/{chat_id}").status_code == 400
+    assert client.delete(f"/api/chats/{chat_id}").status_code == 400
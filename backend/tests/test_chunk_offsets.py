@@ -0,0 +1,32 @@
+"""Chunk offsets from the splitter itself.
+
+split_with_offsets re-implements the langchain splitter on spans, so what
+pins it is that it emits exactly text_splitter's chunks, and that each
+offset points at its own chunk even when the text repeats.
+"""
+
+import random
+
+from services.ingest import split_with_offsets, text_splitter
+
+_PIECES = ["word", "longerword", "\n\n", "\n", ". ", " ", "  ", "x" * 400, "\n \n"]
+
+
+def test_the_chunks_are_text_splitters_chunks():
+    rng = random.Random(7)
+    for _ in range(50):
+        text = "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 400)))
+
+        spans = split_with_offsets(text)
+
+        assert [text[start:end] for start, end in spans] == text_splitter.split_text(text)
+
+
+def test_a_repeated_passage_gets_its_own_offset():
+    passage = "The same boilerplate notice. " * 40
+    text = "\n\n".join([passage] * 4)
+
+    spans = split_with_offsets(text)
+
+    assert [start for start, _ in spans] == sorted({start for start, _ in spans})
+    assert spans[-1][1] == len(text.rstrip())
@@ -13,8 +13,17 @@ from pathlib import Path
 import pytest
 
 from config import HAIKU_MODEL
+from prompts import CONTEXTUALIZER_PROMPT
 from services import usage
-from services.llm import Budget, ModelSpec, Prompt, Purpose, _to_result, complete
+from services.llm import (
+    Budget,
+    ModelSpec,
+    Prompt,
+    Purpose,
+    _to_result,
+    complete,
+    stream_complete,
+)
 
 _REPO = Path(__file__).resolve().parents[2]
 
@@ -55,7 +64,7 @@ async def _run_turn(monkeypatch, route: str) -> dict:
 
     meta = {}
     async for event in agent.stream_research_agent(
-        [{"role": "user", "content": "what does the paper say about scaling"}]
+        [("user", "what does the paper say about scaling")]
     ):
         if event["type"] == "text":
             meta = event["meta"]
@@ -118,6 +127,13 @@ class _FakeProvider:
         }
         return msg
 
+    async def astream(self, messages):
+        from langchain_core.messages import AIMessageChunk
+
+        msg = await self.ainvoke(messages)
+        yield AIMessageChunk(content=msg.content, response_metadata=msg.response_metadata)
+        yield AIMessageChunk(content="", usage_metadata=msg.usage_metadata)
+
 
 @pytest.mark.parametrize("route", ["fast_fact", "normal_rag", "deep_research"])
 async def test_the_dollar_total_in_the_footer_is_the_turn_s_real_spend(monkeypatch, route):
@@ -163,8 +179,6 @@ async def test_stub_calls_are_free_and_flagged_not_priced_as_real_spend():
     priced=True. A keyless development run wrote fabricated dollars into the
     same monthly file a real key writes to.
     """
-    from prompts import CONTEXTUALIZER_PROMPT
-
     budget = Budget.background("ingest", max_calls=2)
     prompt = Prompt.render(
         CONTEXTUALIZER_PROMPT,
@@ -184,6 +198,83 @@ async def test_stub_calls_are_free_and_flagged_not_priced_as_real_spend():
     assert mtd["stub"]["input_tokens"] == mtd["total"]["input_tokens"]
 
 
+async def test_an_abandoned_stream_still_gets_its_ledger_row():
+    """A client that disconnects mid-answer ends the generator with
+    GeneratorExit, which an `except Exception` never sees; the call was
+    still authorized and billed, so its row must not vanish with it."""
+    budget = Budget.background("ingest", max_calls=1)
+    prompt = Prompt.render(
+        CONTEXTUALIZER_PROMPT,
+        {"whole_document": "d" * 8000, "chunk_content": "c" * 400},
+    )
+
+    stream = stream_complete(Purpose.CONTEXTUALIZE, prompt, budget)
+    assert isinstance(await anext(stream), str)
+    await stream.aclose()
+
+    rows = _ledger_rows()
+    assert len(rows) == 1
+    assert rows[0]["failed"] is True
+    assert budget.calls_made == len(rows)
+
+
+async def test_an_empty_stream_is_recorded_as_failed_and_raises(monkeypatch):
+    from services import llm
+
+    class _SilentProvider(_FakeProvider):
+        async def astream(self, messages):
+            return
+            yield
+
+    monkeypatch.setattr(llm, "MODEL_STUB", False)
+    monkeypatch.setattr(llm, "ANTHROPIC_API_KEY", "test-key-not-used")
+    monkeypatch.setattr(llm, "ChatAnthropic", _SilentProvider)
+    budget = Budget.background("ingest", max_calls=1)
+    prompt = Prompt.render(
+        CONTEXTUALIZER_PROMPT,
+        {"whole_document": "d" * 8000, "chunk_content": "c" * 400},
+    )
+
+    with pytest.raises(RuntimeError, match="empty stream"):
+        async for _ in stream_complete(Purpose.CONTEXTUALIZE, prompt, budget):
+            pass
+
+    rows = _ledger_rows()
+    assert len(rows) == 1
+    assert rows[0]["failed"] is True
+
+
+async def test_a_cancelled_call_still_gets_its_ledger_row(monkeypatch):
+    """Ingest cancels the sibling requests of a failed one; the request
+    was already sent, so cancelling it must not also erase its row."""
+    import asyncio
+
+    from services import llm
+
+    class _SlowProvider(_FakeProvider):
+        async def ainvoke(self, messages):
+            await asyncio.sleep(10)
+
+    monkeypatch.setattr(llm, "MODEL_STUB", False)
+    monkeypatch.setattr(llm, "ANTHROPIC_API_KEY", "test-key-not-used")
+    monkeypatch.setattr(llm, "ChatAnthropic", _SlowProvider)
+    budget = Budget.background("ingest", max_calls=1)
+    prompt = Prompt.render(
+        CONTEXTUALIZER_PROMPT,
+        {"whole_document": "d" * 8000, "chunk_content": "c" * 400},
+    )
+
+    call = asyncio.create_task(complete(Purpose.CONTEXTUALIZE, prompt, budget))
+    await asyncio.sleep(0.01)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    rows = _ledger_rows()
+    assert len(rows) == 1
+    assert rows[0]["failed"] is True
+
+
 def test_a_response_without_usage_metadata_is_unpriced_not_free():
     """Zeroed counts against a known model used to report a priced $0.00 call.
 
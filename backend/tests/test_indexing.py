@@ -5,10 +5,13 @@ embeds and no model is downloaded. The contextualisation branch is
 exercised through ORIGAMI_MODEL_STUB, at zero cost.
 """
 
+import asyncio
 import json
 from datetime import datetime, timezone
 
-from services import usage
+import pytest
+
+from services import indexing, ingest, usage
 from services.embeddings import current_embedding_model_id
 from services.indexing import SegmentDraft, index_item
 from services.schema import (
@@ -147,6 +150,22 @@ async def test_contextualization_is_skipped_on_length(fake_collection):
     assert _ledger_rows() == []
 
 
+async def test_contextualization_is_skipped_on_a_table_of_numbers(fake_collection):
+    table = "1024 2048 4096\n" * 600
+    await index_item(
+        _item(),
+        [
+            SegmentDraft(ordinal=0, modality="text", content=table, content_source="extracted"),
+            _draft(1, "text", 10_000),
+        ],
+        whole_text=table + "x" * 10_000,
+    )
+
+    statuses = [rec[2]["context_status"] for rec in fake_collection.records]
+    assert sorted(statuses) == ["ok", "skipped"]
+    assert len(_ledger_rows()) == 1
+
+
 async def test_contextualization_fires_for_long_text_segments(fake_collection):
     whole = "x" * 20_000
     await index_item(
@@ -182,6 +201,21 @@ async def test_the_contextualization_calls_are_billed_to_a_background_permit(fak
     assert all(row["cost_usd"] == 0.0 and row["priced"] is False for row in rows)
 
 
+async def test_a_reindex_reuses_the_stored_contexts(fake_collection):
+    """The blurb depends only on the document and the chunk, so the same
+    bytes indexed again must not pay for the calls a second time."""
+    drafts = [_draft(0, "text", 10_000), _draft(1, "text", 10_000)]
+    await index_item(_item(), drafts, whole_text="x" * 20_000)
+    calls = len(_ledger_rows())
+
+    await index_item(_item(), drafts, whole_text="x" * 20_000)
+
+    assert len(_ledger_rows()) == calls
+    for _id, document, meta in fake_collection.records:
+        assert meta["context_status"] == "ok"
+        assert document == f"{_STUB_BLURB}\n\n{'x' * 10_000}"
+
+
 async def test_no_drafts_writes_nothing(fake_collection):
     assert await index_item(_item(), []) == 0
     assert fake_collection.records == []
@@ -220,3 +254,75 @@ async def test_every_record_carries_the_expected_segment_count(fake_collection):
     await index_item(_item(), [_draft(0, "ocr", 20), _draft(1, "ocr", 20)])
 
     assert {rec[2]["segment_total"] for rec in fake_collection.records} == {2}
+
+
+async def test_a_failed_batch_write_stops_the_contextualization_fan_out(
+    fake_collection, monkeypatch
+):
+    """Once an upsert has failed nothing will write the remaining segments,
+    so the producers must stop paying for their contexts rather than run
+    the whole Item through the model and fail only at the end."""
+    monkeypatch.setattr(ingest, "_UPSERT_BATCH", 1)
+    upserts = 0
+    real_upsert = fake_collection.upsert
+
+    def flaky_upsert(ids, documents, metadatas):
+        nonlocal upserts
+        upserts += 1
+        if upserts == 2:
+            raise RuntimeError("disk full")
+        real_upsert(ids, documents, metadatas)
+
+    monkeypatch.setattr(fake_collection, "upsert", flaky_upsert)
+    calls = 0
+    real_contextualize = indexing.contextualize_chunk
+
+    async def slow_contextualize(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return await real_contextualize(*args, **kwargs)
+
+    monkeypatch.setattr(indexing, "contextualize_chunk", slow_contextualize)
+    drafts = [_draft(i, "text", 10_000) for i in range(24)]
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        await index_item(_item(), drafts, whole_text="x" * 240_000)
+    made = calls
+    await asyncio.sleep(0.2)
+
+    assert made < len(drafts)
+    assert calls == made
+
+
+async def test_a_failed_producer_cancels_its_siblings(fake_collection, monkeypatch):
+    """gather raises on the first failure and leaves the rest running, so
+    their model calls went on being paid for and their segments reached a
+    writer that had already closed, where they were dropped without error."""
+    calls = 0
+    real_contextualize = indexing.contextualize_chunk
+
+    async def slow_contextualize(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return await real_contextualize(*args, **kwargs)
+
+    real_metadata = indexing.segment_metadata
+
+    def failing_metadata(item, segment, extra=None):
+        if segment.ordinal == 3:
+            raise ValueError("bad span")
+        return real_metadata(item, segment, extra=extra)
+
+    monkeypatch.setattr(indexing, "contextualize_chunk", slow_contextualize)
+    monkeypatch.setattr(indexing, "segment_metadata", failing_metadata)
+    drafts = [_draft(i, "text", 10_000) for i in range(24)]
+
+    with pytest.raises(ValueError, match="bad span"):
+        await index_item(_item(), drafts, whole_text="x" * 240_000)
+    made = calls
+    await asyncio.sleep(0.2)
+
+    assert made < len(drafts)
+    assert calls == made
@@ -0,0 +1,53 @@
+"""The LaTeX-tolerant JSON repair behind final_response_node.
+
+The answer model writes raw LaTeX inside JSON strings, where \\frac reads as
+a form feed plus "rac". These cases pin which backslashes the repair
+doubles, so folding its rules into fewer passes cannot move the line
+between a LaTeX command and a real escape.
+"""
+
+import pytest
+
+from services.agent import _extract_json, _fix_json_escapes
+
+
+@pytest.mark.parametrize("raw, fixed", [
+    # Not a JSON escape at all: always doubled
+    (r"\alpha", r"\\alpha"),
+    (r"\sum", r"\\sum"),
+    ("ends with \\", "ends with \\\\"),
+    # \b and \f before any letter are LaTeX
+    (r"\beta \frac \Big", r"\\beta \\frac \\Big"),
+    (r"\b1 \f.", r"\b1 \f."),
+    # \n \r \t only before a lowercase letter
+    (r"\nabla \rho \text", r"\\nabla \\rho \\text"),
+    (r"\nA \t1 \r", r"\nA \t1 \r"),
+    # Real escapes are left alone
+    (r"\" \/ \u00e9", r"\" \/ \u00e9"),
+])
+def test_only_latex_shaped_backslashes_are_doubled(raw, fixed):
+    assert _fix_json_escapes(raw) == fixed
+
+
+def test_latex_in_a_message_survives_the_round_trip():
+    raw = r'{"action": "chat", "message": "\sum \frac{1}{2}\beta and \nabla f.\nDone"}'
+
+    payload, strategy = _extract_json(raw)
+
+    assert strategy == "direct"
+    assert payload["message"] == "\\sum \\frac{1}{2}\\beta and \\nabla f.\nDone"
+
+
+def test_a_fenced_payload_is_found():
+    raw = 'Here you go:\n```json\n{"action": "chat", "message": "hi"}\n```'
+
+    assert _extract_json(raw) == ({"action": "chat", "message": "hi"}, "fence")
+
+
+def test_broken_json_falls_back_to_field_extraction():
+    raw = '{"action": "chat", "message": "cut \\beta off", "content": "x" trailing'
+
+    payload, strategy = _extract_json(raw + "}")
+
+    assert strategy == "regex"
+    assert payload == {"action": "chat", "message": "cut \\beta off", "content": "x"}
@@ -23,13 +23,25 @@ def _counts() -> dict[str, int]:
     return out
 
 
-async def _run(monkeypatch, route: str, query: str = "what does the paper say about scaling") -> dict[str, int]:
+async def _run(
+    monkeypatch,
+    route: str,
+    query: str = "what does the paper say about scaling",
+    fresh_chunks: bool = True,
+) -> dict[str, int]:
     from services import agent
 
+    searches = 0
+
     async def fake_search(q, n_results=5, file_ids=None):
+        # Each search finds new chunks unless told otherwise: a pass that
+        # finds only what the last one found ends the loop early.
+        nonlocal searches
+        offset = 5 * searches if fresh_chunks else 0
+        searches += 1
         return [
             {
-                "text": f"chunk {i} about scaling",
+                "text": f"chunk {offset + i} about scaling",
                 "source": "paper.pdf",
                 "source_type": "pdf",
                 "modality": "text",
@@ -54,7 +66,7 @@ async def _run(monkeypatch, route: str, query: str = "what does the paper say ab
 
     monkeypatch.setattr(agent, "classify_query", fake_classify)
 
-    async for _ in agent.stream_research_agent([{"role": "user", "content": query}]):
+    async for _ in agent.stream_research_agent([("user", query)]):
         pass
     return _counts()
 
@@ -84,6 +96,11 @@ async def test_deep_research_is_seven_calls(monkeypatch):
     assert sum(counts.values()) == max_calls_for("deep_research", 3) == 7
 
 
+async def test_a_repeated_retrieval_ends_the_loop_without_reanalyzing(monkeypatch):
+    counts = await _run(monkeypatch, "deep_research", fresh_chunks=False)
+    assert counts == {"classify": 1, "analyze": 1, "review": 1, "final_response": 1}
+
+
 async def test_no_chunks_skips_analyze_and_downgrades_the_final_call(monkeypatch):
     """An empty retrieval used to pay for Sonnet to say it found nothing."""
     from config import HAIKU_MODEL
@@ -93,7 +110,7 @@ async def test_no_chunks_skips_analyze_and_downgrades_the_final_call(monkeypatch
         return []
 
     monkeypatch.setattr(agent, "vector_search", empty_search)
-    async for _ in agent.stream_research_agent([{"role": "user", "content": "what does the paper say about scaling"}]):
+    async for _ in agent.stream_research_agent([("user", "what does the paper say about scaling")]):
         pass
 
     counts = _counts()
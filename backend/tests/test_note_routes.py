@@ -0,0 +1,102 @@
+"""The /api/notes routes and the title cache behind the listing.
+
+The listing only re-reads a note whose mtime moved, so every way a note
+changes, through the API, the agent's write helpers, or an editor outside
+the app, has to surface in the next listing.
+"""
+
+import os
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from config import NOTES_DIR
+import routes.notes as notes
+
+
+@pytest.fixture
+def client():
+    for path in NOTES_DIR.iterdir():
+        path.unlink()
+    notes._title_cache.clear()
+
+    app = FastAPI()
+    app.include_router(notes.router, prefix="/api")
+    return TestClient(app)
+
+
+def _titles(client) -> dict[str, str]:
+    return {n["id"]: n["title"] for n in client.get("/api/notes").json()}
+
+
+def test_a_rename_through_the_api_shows_in_the_listing(client):
+    note_id = client.post("/api/notes", json={"title": "Draft"}).json()["id"]
+    assert _titles(client) == {note_id: "Draft"}
+
+    client.put(f"/api/notes/{note_id}", json={"content": "# Final\n\nbody"})
+
+    assert _titles(client) == {note_id: "Final"}
+
+
+def test_an_edit_outside_the_app_shows_in_the_listing(client):
+    note_id = client.post("/api/notes", json={"title": "Draft"}).json()["id"]
+    _titles(client)
+    path = NOTES_DIR / f"{note_id}.md"
+    stat = path.stat()
+
+    path.write_text("# Edited elsewhere\n", encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert _titles(client) == {note_id: "Edited elsewhere"}
+
+
+def test_a_note_without_a_heading_is_titled_by_its_filename(client):
+    (NOTES_DIR / "research.md").write_text("- a finding\n", encoding="utf-8")
+
+    assert _titles(client) == {"research": "research"}
+
+
+def test_a_deleted_note_leaves_the_listing(client):
+    note_id = client.post("/api/notes", json={"title": "Gone"}).json()["id"]
+    _titles(client)
+
+    client.delete(f"/api/notes/{note_id}")
+
+    assert _titles(client) == {}
+    assert notes._title_cache == {}
+
+
+def test_append_matches_a_stripped_rewrite(client):
+    note_id = client.post("/api/notes", json={"title": "Log"}).json()["id"]
+    path = NOTES_DIR / f"{note_id}.md"
+    path.write_text("# Log\n\nfirst" + " \n" * 3000, encoding="utf-8")
+    before = path.read_text(encoding="utf-8")
+
+    result = notes.append_to_note(note_id, "second\n")
+
+    assert path.read_text(encoding="utf-8") == before.rstrip() + "\n\nsecond\n"
+    assert result["title"] == "Log"
+    assert _titles(client) == {note_id: "Log"}
+
+
+def test_append_can_give_a_headingless_note_its_title(client):
+    (NOTES_DIR / "research.md").write_text("\n\n", encoding="utf-8")
+    assert _titles(client) == {"research": "research"}
+
+    result = notes.append_to_note("research", "# Findings\n")
+
+    assert (NOTES_DIR / "research.md").read_text(encoding="utf-8") == "\n\n# Findings\n"
+    assert result["title"] == "Findings"
+
+
+@pytest.mark.parametrize("note_id", ["../secret", "a/../../x", "/etc/passwd"])
+def test_an_id_outside_the_notes_dir_is_refused(note_id):
+    with pytest.raises(HTTPException) as excinfo:
+        notes._note_path(note_id)
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.parametrize("note_id", ["research", "3e513655-6f2f-41ca-bb3e-fa32ee05dab9", "my note"])
+def test_an_id_inside_the_notes_dir_is_accepted(note_id):
+    assert notes._note_path(note_id).parent == NOTES_DIR.resolve()
@@ -5,7 +5,7 @@ prompt, and the final synthesis, so a duplicate on deep_research is paid
 for up to four times.
 """
 
-from services.agent import NOTES_CAP, _merge_notes
+from services.agent import NOTE_CHARS, NOTES_CAP, _extract_notes, _merge_notes
 
 
 def test_exact_duplicates_are_dropped():
@@ -50,3 +50,8 @@ def test_the_cap_bounds_a_pathological_output():
 def test_a_full_list_accepts_nothing_further():
     existing = [f"finding {i}" for i in range(NOTES_CAP)]
     assert _merge_notes(existing, ["a genuinely new finding"]) == []
+
+
+def test_a_paragraph_written_as_a_bullet_is_clipped():
+    notes = _extract_notes("- short finding here\n- " + "x" * 5000)
+    assert notes == ["short finding here", "x" * NOTE_CHARS]
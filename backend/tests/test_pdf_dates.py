@@ -0,0 +1,27 @@
+"""PDF metadata dates, as stored in publish_date.
+
+The format is D:YYYYMMDDHHmmSS plus a zone, and producers truncate it
+anywhere after the year, so each truncation has to come out as a date.
+"""
+
+import pytest
+
+from services.ingest import _parse_pdf_date
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("D:20240315120000Z", "2024-03-15"),
+    ("D:20240315120000+05'30'", "2024-03-15"),
+    ("D:202403151200", "2024-03-15"),
+    ("D:20240315", "2024-03-15"),
+    ("D:202403", "2024-03-01"),
+    ("D:2024", "2024-01-01"),
+    ("20240315", "2024-03-15"),
+])
+def test_every_truncation_parses(raw, expected):
+    assert _parse_pdf_date(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["", "D:", "D:24", "not a date", "D:20241340"])
+def test_a_missing_or_invalid_date_is_none(raw):
+    assert _parse_pdf_date(raw) is None
@@ -0,0 +1,104 @@
+"""The PDF side of contextualisation: which chunks pay for a model blurb,
+and which stored blurbs a chunk may reuse.
+
+Where a PDF is needed it is built with PyMuPDF in tmp_path and ingested
+against the fake_collection recorder in stub mode, so nothing embeds and
+nothing is billed; the ledger still records every call that would have
+been.
+"""
+
+import json
+from datetime import datetime, timezone
+
+import fitz
+
+from config import CONTEXT_DOC_CHARS
+from services import usage
+from services.ingest import context_key, ingest_pdf, known_contexts
+from services.schema import Item, provenance_for_upload
+
+_SHORT = "Figure 3: validation loss against chunk size for the three encoders."
+
+
+def _item(title: str) -> Item:
+    return Item(
+        id="pdf-abc",
+        source_type="pdf",
+        source_id="cafebabe",
+        title=title,
+        created_at="",
+        ingested_at=datetime.now(timezone.utc).isoformat(),
+        provenance=provenance_for_upload(),
+        raw_ref="pdfs/paper.pdf",
+    )
+
+
+def _pdf(tmp_path, text: str):
+    path = tmp_path / "paper.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _ledger_rows() -> list[dict]:
+    path = usage.ledger_path()
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+async def test_a_short_chunk_gets_a_templated_context_and_no_call(
+    tmp_path, fake_collection, monkeypatch
+):
+    """A tail or caption fragment still needs to say where it came from,
+    but not at the price of a model call."""
+    monkeypatch.setattr("services.ingest.get_collection", lambda: fake_collection)
+
+    written = await ingest_pdf(_pdf(tmp_path, _SHORT), _item("Chunking Matters"))
+
+    assert written == 1
+    _id, document, meta = fake_collection.records[0]
+    assert meta["context_status"] == "templated"
+    assert document == f"This excerpt is from 'Chunking Matters' (page 1).\n\n{meta['original_chunk']}"
+    assert _ledger_rows() == []
+
+
+async def test_a_templated_context_is_not_reused_as_a_model_blurb(
+    tmp_path, fake_collection, monkeypatch
+):
+    monkeypatch.setattr("services.ingest.get_collection", lambda: fake_collection)
+
+    await ingest_pdf(_pdf(tmp_path, _SHORT), _item("Chunking Matters"))
+
+    assert known_contexts(fake_collection, "cafebabe") == {}
+
+
+def test_a_context_past_the_prefix_is_keyed_on_its_position_too():
+    """Past CONTEXT_DOC_CHARS the model also saw the text around the chunk,
+    so a repeat of the same text elsewhere must not reuse that blurb."""
+    chunk = "Results are reported as the mean of three seeds."
+
+    assert context_key(chunk, 0) == context_key(chunk, 500) == chunk
+    assert context_key(chunk, CONTEXT_DOC_CHARS) != context_key(chunk, CONTEXT_DOC_CHARS + 900)
+
+
+def test_stored_contexts_come_back_under_the_key_they_were_written_with(fake_collection):
+    chunk = "Results are reported as the mean of three seeds."
+    far = CONTEXT_DOC_CHARS + 900
+    for ordinal, start in enumerate((100, far)):
+        fake_collection.upsert(
+            ids=[f"pdf-abc-{ordinal}"],
+            documents=[f"Blurb {ordinal}.\n\n{chunk}"],
+            metadatas=[{
+                "content_hash": "cafebabe",
+                "context_status": "ok",
+                "original_chunk": chunk,
+                "char_start": start,
+            }],
+        )
+
+    contexts = known_contexts(fake_collection, "cafebabe")
+
+    assert contexts == {chunk: "Blurb 0.", (far, chunk): "Blurb 1."}
@@ -87,6 +87,27 @@ async def test_stub_mode_dumps_the_request_with_its_cache_block():
     assert "CHUNK BODY" in content[1]["text"]
 
 
+async def test_a_chunk_past_the_prefix_gets_its_surroundings_under_the_same_cache_block():
+    from config import CONTEXT_DOC_CHARS
+    from services import usage
+    from services.ingest import contextualize_chunk
+    from services.llm import Budget
+
+    document = "d" * CONTEXT_DOC_CHARS + "NEARBY BEFORE" + "CHUNK BODY" + "NEARBY AFTER"
+    start = document.index("CHUNK BODY")
+    budget = Budget.background("ingest", max_calls=2)
+    await contextualize_chunk(document, "d" * 100, budget, span=(0, 100))
+    await contextualize_chunk(document, "CHUNK BODY", budget, span=(start, start + 10))
+
+    near, far = (
+        json.loads(path.read_text())["messages"][0]["content"]
+        for path in sorted(usage.REQUESTS_DIR.glob("*-contextualize.json"))
+    )
+    assert near[0] == far[0]
+    assert "NEARBY" not in near[1]["text"]
+    assert "NEARBY BEFORE\n[... the chunk ...]\nNEARBY AFTER" in far[1]["text"]
+
+
 def _final_prompt(allow_edits: bool) -> str:
     from prompts import (
         CHAT_ONLY_INSTRUCTION,
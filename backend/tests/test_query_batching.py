@@ -0,0 +1,63 @@
+"""Query embeddings coalesced across concurrent searches.
+
+The batcher shares futures between callers, so what needs pinning is that
+every caller gets its own text's vector back, that one model call serves
+the whole window, and that a caller giving up does not take the others
+down with it.
+"""
+
+import asyncio
+
+import pytest
+
+import services.embeddings as embeddings
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.fixture
+def model(monkeypatch):
+    fake = CountingModel()
+    monkeypatch.setattr(embeddings, "_query_embedding_function", lambda: fake)
+    embeddings._query_vectors.clear()
+    yield fake
+    embeddings._query_vectors.clear()
+
+
+def test_concurrent_misses_share_one_model_call(model):
+    async def run():
+        return await asyncio.gather(*(
+            embeddings.embed_query(text) for text in ["a", "bb", "a", "ccc"]
+        ))
+
+    vectors = asyncio.run(run())
+
+    assert vectors == [(1.0, 1.0), (2.0, 1.0), (1.0, 1.0), (3.0, 1.0)]
+    assert model.calls == [["a", "bb", "ccc"]]
+
+
+def test_a_repeated_query_is_not_embedded_again(model):
+    async def run():
+        await embeddings.embed_query("attention")
+        return await embeddings.embed_query("attention")
+
+    assert asyncio.run(run()) == (9.0, 1.0)
+    assert model.calls == [["attention"]]
+
+
+def test_a_cancelled_search_leaves_the_other_waiter_its_vector(model):
+    async def run():
+        abandoned = asyncio.create_task(embeddings.embed_query("dd"))
+        kept = asyncio.create_task(embeddings.embed_query("dd"))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        return await kept
+
+    assert asyncio.run(run()) == (2.0, 1.0)
@@ -0,0 +1,45 @@
+"""The tag list offered for filtering and retagging.
+
+Tags are read from the cached heads, so what needs pinning is the Item
+with no head: an ingest that died before its ordinal-0 segment still
+leaves an Item the library lists, and its tags must still be offered.
+"""
+
+import chromadb
+import pytest
+
+import services.chroma as chroma
+from config import SAVED_TAGS_FILE
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    store = chromadb.EphemeralClient().get_or_create_collection("tags-test")
+    monkeypatch.setattr(chroma, "get_collection", lambda: store)
+    SAVED_TAGS_FILE.unlink(missing_ok=True)
+    chroma.invalidate_heads()
+    yield store
+    chroma.invalidate_heads()
+    chromadb.EphemeralClient().delete_collection("tags-test")
+
+
+def _add(store, file_id: str, chunk_index: int, tags: list[str]) -> None:
+    store.add(
+        ids=[f"{file_id}-{chunk_index}"],
+        embeddings=[[1.0, 0.0]],
+        metadatas=[{"file_id": file_id, "chunk_index": chunk_index, "tags": tags}],
+    )
+
+
+def test_tags_come_from_heads_and_headless_items(collection):
+    _add(collection, "whole", 0, ["attention"])
+    _add(collection, "whole", 1, ["attention"])
+    _add(collection, "truncated", 3, ["diffusion"])
+
+    assert chroma.list_all_tags() == ["attention", "diffusion"]
+
+
+def test_a_store_with_no_heads_still_lists_tags(collection):
+    _add(collection, "truncated", 2, ["rl"])
+
+    assert chroma.list_all_tags() == ["rl"]
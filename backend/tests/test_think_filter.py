@@ -0,0 +1,34 @@
+"""Think-tag filtering on a streamed answer.
+
+The streamed deltas and the final text must agree, so whatever way the
+model's output is cut into deltas, the filter has to pass exactly what
+strip_think_tags() keeps.
+"""
+
+import pytest
+
+from services.text_utils import ThinkTagFilter, strip_think_tags
+
+SAMPLES = [
+    "plain answer",
+    "<think>weigh it</think>The answer is 4.",
+    "a <think>x</think>b<think>y</think> c",
+    "less < than and <thin ice",
+    "ends mid tag <thi",
+]
+
+
+def _stream(text: str, size: int) -> str:
+    think = ThinkTagFilter()
+    out = [think.feed(text[i:i + size]) for i in range(0, len(text), size)]
+    return "".join(out) + think.flush()
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 1000])
+def test_any_split_matches_the_batch_strip(text, size):
+    assert _stream(text, size).strip() == strip_think_tags(text)
+
+
+def test_an_open_block_hides_the_rest_of_the_stream():
+    assert _stream("shown <think>never closed", 4) == "shown "
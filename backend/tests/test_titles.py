@@ -0,0 +1,22 @@
+"""Subtitle splitting for suggested titles and shortened titles.
+
+Both split at the highest-priority separator present, not the earliest
+one in the title, and a separator with nothing after it gives way to the
+next, so these pin the priority for titles mixing several.
+"""
+
+from services.ingest import _pick_subtitle
+from services.text_utils import shorten_title
+
+
+def test_a_mixed_separator_title_splits_at_the_colon():
+    assert _pick_subtitle("GPT-4 - Technical Report: Appendix") == "Appendix"
+    assert shorten_title("Deep Nets - Survey: Part Two") == "deep nets - survey"
+
+
+def test_an_empty_subtitle_falls_through_to_the_next_separator():
+    assert _pick_subtitle("Attention - All You Need:") == "All You Need:"
+
+
+def test_a_title_without_a_separator_is_kept():
+    assert _pick_subtitle("Attention Is All You Need") == "Attention Is All You Need"
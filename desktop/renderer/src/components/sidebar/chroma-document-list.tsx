@@ -10,6 +10,12 @@ import { useTagColors } from "@/lib/tag-colors";
 import type { ChromaDocument } from "@/types";
 import type { PendingIngestion } from "./document-drawer";
 
+// Confirm no longer pre-splits the PDF, so the expected count usually
+// arrives with the first ingested segment rather than with the upload.
+function expectedChunks(pending: PendingIngestion, doc?: ChromaDocument): number {
+  return pending.totalChunks || doc?.segment_total || 0;
+}
+
 interface ChromaDocumentListProps {
   pendingIngestions?: PendingIngestion[];
   onIngestionComplete?: (fileId: string) => void;
@@ -50,11 +56,13 @@ export default function ChromaDocumentList({
 
   const checkCompleted = useCallback((data: ChromaDocument[] | null) => {
     if (!data || !onCompleteRef.current) return;
-    const chromaMap = new Map(data.map((d) => [d.file_id, d.chunk_count]));
+    const docMap = new Map(data.map((d) => [d.file_id, d]));
     for (const pending of pendingRef.current) {
-      const current = chromaMap.get(pending.fileId) ?? 0;
+      const doc = docMap.get(pending.fileId);
+      const current = doc?.chunk_count ?? 0;
+      const expected = expectedChunks(pending, doc);
       // Only mark complete when ALL chunks are ingested
-      if (pending.totalChunks > 0 && current >= pending.totalChunks) {
+      if (expected > 0 && current >= expected) {
         onCompleteRef.current(pending.fileId);
       }
     }
@@ -119,8 +127,8 @@ export default function ChromaDocumentList({
 
   const totalChunks = docs.reduce((sum, d) => sum + d.chunk_count, 0);
 
-  // Build a map of current chunk counts for progress tracking
-  const chromaMap = new Map(docs.map((d) => [d.file_id, d.chunk_count]));
+  // Build a map of current documents for progress tracking
+  const docMap = new Map(docs.map((d) => [d.file_id, d]));
 
   if (loading) {
     return (
@@ -162,11 +170,13 @@ export default function ChromaDocumentList({
       {/* Pending ingestion cards */}
       <AnimatePresence initial={false}>
         {pendingIngestions.map((pending) => {
-          const currentChunks = chromaMap.get(pending.fileId) ?? 0;
+          const doc = docMap.get(pending.fileId);
+          const currentChunks = doc?.chunk_count ?? 0;
+          const totalChunks = expectedChunks(pending, doc);
           const hasChunks = currentChunks > 0;
           const progress =
-            pending.totalChunks > 0
-              ? Math.round((currentChunks / pending.totalChunks) * 100)
+            totalChunks > 0
+              ? Math.round((currentChunks / totalChunks) * 100)
               : 0;
           return (
             <motion.div
@@ -194,7 +204,7 @@ export default function ChromaDocumentList({
                   </p>
                   <span className="text-[10px] font-mono text-blue-500/70">
                     {hasChunks
-                      ? `${currentChunks}/${pending.totalChunks} chunks`
+                      ? `${currentChunks}/${totalChunks || "?"} chunks`
                       : "Processing..."}
                   </span>
                 </div>
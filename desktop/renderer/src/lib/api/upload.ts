@@ -40,7 +40,7 @@ export async function confirmUpload(
   id: string,
   name: string,
   tags: string[] = []
-): Promise<{ id: string; filename: string; size: number; total_chunks: number; status: string }> {
+): Promise<{ id: string; filename: string; size: number; total_chunks: number | null; status: string }> {
   const response = await apiFetch(`${API_URL}/api/upload/confirm`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
@@ -31,6 +31,8 @@ export interface ChromaDocument {
   /** pdf | note | snippet | screenshot | ... — the knowledge base is no longer PDFs only. */
   source_type: string;
   chunk_count: number;
+  /** Chunks the document will have once ingestion finishes; null on older records. */
+  segment_total?: number | null;
   tags: string[];
   publish_date?: string;
 }